@@ -7,241 +7,210 @@ Provides quick access to all LeetCode practice tools.
 import sys
 import subprocess
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import click
 
+from tools import claude_helper, problem_manager, test_runner
 
-@click.group()
-def cli():
-    """🎯 LeetCode Practice Helper - Your AI-powered coding practice companion"""
-    pass
-
-
-@cli.command()
-@click.option('--title', '-t', required=True, help='Problem title')
-@click.option('--difficulty', '-d', required=True,
-              type=click.Choice(['easy', 'medium', 'hard'], case_sensitive=False),
-              help='Problem difficulty')
-@click.option('--topics', required=True, help='Comma-separated list of topics')
-@click.option('--description', help='Problem description')
-@click.option('--url', help='LeetCode URL')
-def add(title: str, difficulty: str, topics: str, description: str, url: str):
-    """➕ Add a new problem"""
-    cmd = [
-        sys.executable, 'tools/problem_manager.py', 'add',
-        '--title', title,
-        '--difficulty', difficulty,
-        '--topics', topics
-    ]
-    
-    if description:
-        cmd.extend(['--description', description])
-    if url:
-        cmd.extend(['--url', url])
-    
-    subprocess.run(cmd)
-
-
-@cli.command()
-@click.argument('problem_id')
-@click.option('--language', '-l', default='python',
-              type=click.Choice(['python', 'typescript']),
-              help='Programming language')
-@click.option('--approach', '-a', default='optimal',
-              type=click.Choice(['brute-force', 'optimal', 'multiple']),
-              help='Solution approach')
-def solve(problem_id: str, language: str, approach: str):
-    """🤖 Get AI solution for a problem"""
-    cmd = [
-        sys.executable, 'tools/claude_helper.py', 'solve',
-        '--problem', problem_id,
-        '--language', language,
-        '--approach', approach
-    ]
-    subprocess.run(cmd)
-
-
-@cli.command()
-@click.argument('problem_id')
-@click.option('--level', '-l', default='subtle',
-              type=click.Choice(['subtle', 'medium', 'strong']),
-              help='Hint level')
-def hint(problem_id: str, level: str):
-    """💡 Get a progressive hint"""
-    cmd = [
-        sys.executable, 'tools/claude_helper.py', 'hint',
-        '--problem', problem_id,
-        '--level', level
-    ]
-    subprocess.run(cmd)
-
-
-@cli.command()
-@click.argument('problem_id')
-@click.option('--language', '-l', default='python',
-              type=click.Choice(['python', 'typescript']),
-              help='Programming language')
-def review(problem_id: str, language: str):
-    """🔍 Get AI feedback on your solution"""
-    cmd = [
-        sys.executable, 'tools/claude_helper.py', 'review',
-        '--problem', problem_id,
-        '--language', language
-    ]
-    subprocess.run(cmd)
-
+# Script paths used when a tool is run in a separate process (--isolate)
+_TOOL_SCRIPTS = {
+    claude_helper.cli: 'tools/claude_helper.py',
+    problem_manager.cli: 'tools/problem_manager.py',
+    test_runner.cli: 'tools/test_runner.py',
+}
 
-@cli.command()
-@click.argument('topic')
-@click.option('--context', '-c', help='Additional context')
-def explain(topic: str, context: str):
-    """📚 Explain a concept or algorithm"""
-    cmd = [
-        sys.executable, 'tools/claude_helper.py', 'explain',
-        '--topic', topic
-    ]
-    if context:
-        cmd.extend(['--context', context])
-    subprocess.run(cmd)
 
+def _spawn(args: List[str]) -> int:
+    """Run a Python script in a new interpreter and return its exit code"""
+    # sys.executable is an absolute path, so with close_fds off CPython can
+    # use posix_spawn() rather than fork()+exec()
+    return subprocess.run([sys.executable, *args], close_fds=False).returncode
 
-@cli.command()
-@click.option('--difficulty', '-d', default='medium',
-              type=click.Choice(['easy', 'medium', 'hard']),
-              help='Problem difficulty level')
-@click.option('--topics', '-t', help='Comma-separated list of topics to focus on')
-@click.option('--similar-to', '-s', help='Generate problem similar to this existing problem')
-@click.option('--style', default='leetcode', help='Problem style')
-def generate(difficulty: str, topics: str, similar_to: str, style: str):
-    """🤖 Generate a new practice problem using Claude AI"""
-    cmd = [
-        sys.executable, 'tools/problem_manager.py', 'generate',
-        '--difficulty', difficulty
-    ]
-    
-    if topics:
-        cmd.extend(['--topics', topics])
-    if similar_to:
-        cmd.extend(['--similar-to', similar_to])
-    if style != 'leetcode':
-        cmd.extend(['--style', style])
-    
-    subprocess.run(cmd)
 
+def _invoke(group: click.Group, args: List[str]) -> int:
+    """Run a tool's Click group with the given arguments and return its exit code.
 
-@cli.command()
-@click.argument('problem_id')
-@click.option('--language', '-l', default='python',
-              type=click.Choice(['python', 'typescript']),
-              help='Programming language')
-@click.option('--error', '-e', help='Error message you\'re getting')
-def debug(problem_id: str, language: str, error: str):
-    """🐛 Get help debugging your solution"""
-    cmd = [
-        sys.executable, 'tools/claude_helper.py', 'debug',
-        '--problem', problem_id,
-        '--language', language
-    ]
-    if error:
-        cmd.extend(['--error', error])
-    subprocess.run(cmd)
+    Tools run inside the current interpreter so every command pays Python
+    startup and import costs only once. With --isolate the tool is run in a
+    fresh Python process instead.
+    """
+    ctx = click.get_current_context()
+    if ctx.find_root().obj.get('isolate'):
+        return _spawn([_TOOL_SCRIPTS[group], *args])
 
+    try:
+        rv = group.main(args=args, prog_name=Path(_TOOL_SCRIPTS[group]).name,
+                        standalone_mode=False)
+    except click.exceptions.Exit as e:
+        return e.exit_code
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
 
-@cli.command()
-@click.argument('problem_id')
-@click.option('--approach', '-a', default='high-level',
-              type=click.Choice(['high-level', 'detailed', 'implementation']),
-              help='Level of pseudocode detail')
-def pseudocode(problem_id: str, approach: str):
-    """📝 Get pseudocode for the approach"""
-    cmd = [
-        sys.executable, 'tools/claude_helper.py', 'pseudocode',
-        '--problem', problem_id,
-        '--approach', approach
-    ]
-    subprocess.run(cmd)
+    return rv if isinstance(rv, int) else 0
 
 
-@cli.command()
-@click.argument('problem_id')
-@click.option('--test-case', '-t', help='Specific test case to analyze')
-def walkthrough(problem_id: str, test_case: str):
-    """🚶 Walk through a test case step by step"""
-    cmd = [
-        sys.executable, 'tools/claude_helper.py', 'walkthrough',
-        '--problem', problem_id
-    ]
-    if test_case:
-        cmd.extend(['--test-case', test_case])
-    subprocess.run(cmd)
-
-
-@cli.command()
-@click.argument('problem_id')
-@click.option('--what-tried', '-w', help='What approaches you\'ve already tried')
-def stuck(problem_id: str, what_tried: str):
-    """🆘 Get help when completely stuck"""
-    cmd = [
-        sys.executable, 'tools/claude_helper.py', 'stuck',
-        '--problem', problem_id
-    ]
-    if what_tried:
-        cmd.extend(['--what-tried', what_tried])
-    subprocess.run(cmd)
-
-
-@cli.command()
-@click.argument('problem_id')
-@click.option('--language', '-l', default='both',
-              type=click.Choice(['python', 'typescript', 'both']),
-              help='Language to test')
-@click.option('--verbose', '-v', is_flag=True, help='Verbose output')
-def test(problem_id: str, language: str, verbose: bool):
-    """🧪 Run tests for a problem"""
-    cmd = [
-        sys.executable, 'tools/test_runner.py', 'run',
-        problem_id,
-        '--language', language
-    ]
-    if verbose:
-        cmd.append('--verbose')
-    subprocess.run(cmd)
-
-
-@cli.command()
-@click.option('--difficulty', '-d', help='Filter by difficulty')
-@click.option('--topic', '-t', help='Filter by topic')
-@click.option('--solved/--unsolved', default=None, help='Filter by solved status')
-def list_problems(difficulty: str, topic: str, solved: bool):
-    """📋 List problems"""
-    cmd = [sys.executable, 'tools/problem_manager.py', 'list']
-    
-    if difficulty:
-        cmd.extend(['--difficulty', difficulty])
-    if topic:
-        cmd.extend(['--topic', topic])
-    if solved is not None:
-        cmd.append('--solved' if solved else '--unsolved')
-    
-    subprocess.run(cmd)
-
-
-@cli.command()
-def stats():
-    """📊 Show progress statistics"""
-    subprocess.run([sys.executable, 'tools/problem_manager.py', 'stats'])
-
-
-@cli.command()
-@click.argument('problem_id')
-def show(problem_id: str):
-    """👁️ Show detailed problem information"""
-    subprocess.run([sys.executable, 'tools/problem_manager.py', 'show', problem_id])
-
-
-@cli.command()
-def setup():
+@click.group()
+@click.option('--isolate', is_flag=True,
+              help='Run each tool in a separate Python process')
+@click.pass_context
+def cli(ctx: click.Context, isolate: bool):
+    """🎯 LeetCode Practice Helper - Your AI-powered coding practice companion"""
+    ctx.ensure_object(dict)
+    ctx.obj['isolate'] = isolate
+
+
+def _language(choices: Sequence[str] = ('python', 'typescript'), default: str = 'python',
+              help: str = 'Programming language') -> click.Option:
+    """The --language option shared by most commands"""
+    return click.Option(['--language', '-l'], default=default,
+                        type=click.Choice(list(choices)), help=help)
+
+
+def _choice(opts: List[str], choices: Sequence[str], default: str, help: str) -> click.Option:
+    """An option restricted to a fixed set of values"""
+    return click.Option(opts, default=default, type=click.Choice(list(choices)), help=help)
+
+
+# Commands that forward straight to a tool:
+#   name -> (tool group, tool subcommand, help, parameters, flag for the argument)
+# Options are forwarded under their own long name; the positional argument is
+# forwarded under the given flag, or positionally when that is None.
+_COMMANDS: Dict[str, Tuple[click.Group, str, str, List[click.Parameter], Optional[str]]] = {
+    'add': (problem_manager.cli, 'add', "➕ Add a new problem", [
+        click.Option(['--title', '-t'], required=True, help='Problem title'),
+        click.Option(['--difficulty', '-d'], required=True,
+                     type=click.Choice(['easy', 'medium', 'hard'], case_sensitive=False),
+                     help='Problem difficulty'),
+        click.Option(['--topics'], required=True, help='Comma-separated list of topics'),
+        click.Option(['--description'], help='Problem description'),
+        click.Option(['--url'], help='LeetCode URL'),
+    ], None),
+    'solve': (claude_helper.cli, 'solve', "🤖 Get AI solution for a problem", [
+        click.Argument(['problem_id']),
+        _language(),
+        _choice(['--approach', '-a'], ['brute-force', 'optimal', 'multiple'], 'optimal',
+                'Solution approach'),
+    ], '--problem'),
+    'hint': (claude_helper.cli, 'hint', "💡 Get a progressive hint", [
+        click.Argument(['problem_id']),
+        _choice(['--level', '-l'], ['subtle', 'medium', 'strong'], 'subtle', 'Hint level'),
+        click.Option(['--no-cache'], is_flag=True, help='Ask for a fresh hint instead of a cached one'),
+    ], '--problem'),
+    'review': (claude_helper.cli, 'review', "🔍 Get AI feedback on your solution", [
+        click.Argument(['problem_id']),
+        _language(),
+    ], '--problem'),
+    'explain': (claude_helper.cli, 'explain', "📚 Explain a concept or algorithm", [
+        click.Argument(['topic']),
+        click.Option(['--context', '-c'], help='Additional context'),
+    ], '--topic'),
+    'generate': (problem_manager.cli, 'generate', "🤖 Generate a new practice problem using Claude AI", [
+        _choice(['--difficulty', '-d'], ['easy', 'medium', 'hard'], 'medium',
+                'Problem difficulty level'),
+        click.Option(['--topics', '-t'], help='Comma-separated list of topics to focus on'),
+        click.Option(['--similar-to', '-s'], help='Generate problem similar to this existing problem'),
+        click.Option(['--style'], help='Problem style'),
+        click.Option(['--cache/--no-cache'], default=False,
+                     help='Reuse the problem generated earlier for the same options instead of a fresh one'),
+    ], None),
+    'debug': (claude_helper.cli, 'debug', "🐛 Get help debugging your solution", [
+        click.Argument(['problem_id']),
+        _language(),
+        click.Option(['--error', '-e'], help='Error message you\'re getting'),
+    ], '--problem'),
+    'pseudocode': (claude_helper.cli, 'pseudocode', "📝 Get pseudocode for the approach", [
+        click.Argument(['problem_id']),
+        _choice(['--approach', '-a'], ['high-level', 'detailed', 'implementation'], 'high-level',
+                'Level of pseudocode detail'),
+    ], '--problem'),
+    'walkthrough': (claude_helper.cli, 'walkthrough', "🚶 Walk through a test case step by step", [
+        click.Argument(['problem_id']),
+        click.Option(['--test-case', '-t'], help='Specific test case to analyze'),
+    ], '--problem'),
+    'stuck': (claude_helper.cli, 'stuck', "🆘 Get help when completely stuck", [
+        click.Argument(['problem_id']),
+        click.Option(['--what-tried', '-w'], help='What approaches you\'ve already tried'),
+    ], '--problem'),
+    'batch': (claude_helper.cli, 'batch', "📦 Run a request for every problem listed in a file", [
+        click.Argument(['problem_file']),
+        _choice(['--action', '-a'], ['solve', 'hint', 'pseudocode'], 'solve',
+                'What to ask for each problem'),
+        _language(help='Programming language (solve only)'),
+        click.Option(['--concurrency', '-c'], default=5,
+                     type=click.IntRange(1, claude_helper.MAX_CONCURRENCY),
+                     help='Requests in flight to start with; adjusted to observed latency'),
+        click.Option(['--max-concurrency'], default=claude_helper.MAX_CONCURRENCY,
+                     type=click.IntRange(1, claude_helper.MAX_CONCURRENCY),
+                     help='Upper bound on requests in flight'),
+        click.Option(['--save'], is_flag=True, help='Save each solution to its solution file (solve only)'),
+    ], None),
+    'test': (test_runner.cli, 'run', "🧪 Run tests for a problem", [
+        click.Argument(['problem_id']),
+        _language(['python', 'typescript', 'both'], 'both', 'Language to test'),
+        click.Option(['--verbose', '-v'], is_flag=True, help='Verbose output'),
+    ], None),
+    'list-problems': (problem_manager.cli, 'list', "📋 List problems", [
+        click.Option(['--difficulty', '-d'], help='Filter by difficulty'),
+        click.Option(['--topic', '-t'], help='Filter by topic'),
+        click.Option(['--solved/--unsolved'], default=None, help='Filter by solved status'),
+    ], None),
+    'stats': (problem_manager.cli, 'stats', "📊 Show progress statistics", [], None),
+    'show': (problem_manager.cli, 'show', "👁️ Show detailed problem information", [
+        click.Argument(['problem_id']),
+    ], None),
+}
+
+
+def _forward_args(params: List[click.Parameter], values: Dict[str, Any],
+                  argument_flag: Optional[str]) -> List[str]:
+    """Rebuild a tool's command line from parsed parameter values"""
+    args = []
+    for param in params:
+        value = values[param.name]
+        if value is None:
+            continue
+
+        if isinstance(param, click.Argument):
+            args.extend([argument_flag, str(value)] if argument_flag else [str(value)])
+        elif isinstance(value, bool):
+            # --flag/--no-flag pairs forward either side, plain flags only when set
+            if value:
+                args.append(param.opts[0])
+            elif param.secondary_opts:
+                args.append(param.secondary_opts[0])
+        else:
+            # Values arrive converted (IntRange gives ints); argv takes strings
+            args.extend([param.opts[0], str(value)])
+    return args
+
+
+def _make_command(name: str, group: click.Group, subcommand: str, help: str,
+                  params: List[click.Parameter], argument_flag: Optional[str]) -> click.Command:
+    """Build a command that forwards its parameters to a tool subcommand"""
+    def callback(**values: Any) -> None:
+        _invoke(group, [subcommand, *_forward_args(params, values, argument_flag)])
+
+    return click.Command(name, params=params, callback=callback, help=help)
+
+
+for _name, (_group, _subcommand, _help, _params, _argument_flag) in _COMMANDS.items():
+    cli.add_command(_make_command(_name, _group, _subcommand, _help, _params, _argument_flag))
+
+
+@cli.command()
+@click.pass_context
+def setup(ctx: click.Context):
     """⚙️ Run initial setup"""
-    subprocess.run([sys.executable, 'setup.py'])
+    if ctx.find_root().obj.get('isolate'):
+        _spawn(['setup.py'])
+        return
+
+    from setup import main as run_setup
+    run_setup()
 
 
 @cli.command()
@@ -251,13 +220,13 @@ def demo():
     click.echo("="*50)
     
     click.echo("\n1. 📊 Your current progress:")
-    subprocess.run([sys.executable, 'tools/problem_manager.py', 'stats'])
+    _invoke(problem_manager.cli, ['stats'])
     
     click.echo("\n2. 📋 Available problems:")
-    subprocess.run([sys.executable, 'tools/problem_manager.py', 'list'])
+    _invoke(problem_manager.cli, ['list'])
     
     click.echo("\n3. 🧪 Testing the example 'Two Sum' problem:")
-    subprocess.run([sys.executable, 'tools/test_runner.py', 'run', 'two-sum', '--language', 'python'])
+    _invoke(test_runner.cli, ['run', 'two-sum', '--language', 'python'])
     
     click.echo("\n✨ Try these commands:")
     click.echo("  python leetcode.py hint two-sum --level subtle")
@@ -8,9 +8,15 @@ import os
 import sys
 import subprocess
 import json
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Tuple, Dict, Any
 
+# Setup steps run concurrently; keep their messages from interleaving
+_print_lock = threading.Lock()
+
 
 class Colors:
     """ANSI color codes for terminal output"""
@@ -24,37 +30,55 @@ class Colors:
 
 def print_step(message: str):
     """Print a setup step with styling"""
-    print(f"{Colors.BLUE}{Colors.BOLD}🔧 {message}{Colors.END}")
+    with _print_lock:
+        print(f"{Colors.BLUE}{Colors.BOLD}🔧 {message}{Colors.END}")
 
 
 def print_success(message: str):
     """Print a success message"""
-    print(f"{Colors.GREEN}✅ {message}{Colors.END}")
+    with _print_lock:
+        print(f"{Colors.GREEN}✅ {message}{Colors.END}")
 
 
 def print_warning(message: str):
     """Print a warning message"""
-    print(f"{Colors.YELLOW}⚠️  {message}{Colors.END}")
+    with _print_lock:
+        print(f"{Colors.YELLOW}⚠️  {message}{Colors.END}")
 
 
 def print_error(message: str):
     """Print an error message"""
-    print(f"{Colors.RED}❌ {message}{Colors.END}")
+    with _print_lock:
+        print(f"{Colors.RED}❌ {message}{Colors.END}")
 
 
-def run_command(command: List[str], description: str, check: bool = True) -> Tuple[bool, str]:
-    """Run a shell command and return success status and output"""
+def run_command(command: List[str], description: str, check: bool = True,
+                stream: bool = True) -> Tuple[bool, str]:
+    """Run a shell command and return success status and output
+    
+    With stream=True the command writes straight to the terminal (installers
+    can be very chatty, and capturing makes them block on a full pipe) and
+    the returned output is empty; use stream=False when the output is needed.
+    """
+    # CPython launches the child with posix_spawn() instead of fork()+exec()
+    # when the executable is given as a path and close_fds is off
+    executable = shutil.which(command[0])
+    if executable:
+        command = [executable, *command[1:]]
+    
     try:
         result = subprocess.run(
             command, 
-            capture_output=True, 
+            capture_output=not stream, 
             text=True, 
             check=check,
-            timeout=120
+            timeout=120,
+            close_fds=False
         )
-        return True, result.stdout
+        # With check=False a non-zero exit isn't raised, but is still a failure
+        return result.returncode == 0, result.stdout or ""
     except subprocess.CalledProcessError as e:
-        return False, e.stderr
+        return False, e.stderr or f"{description} failed with exit code {e.returncode}"
     except subprocess.TimeoutExpired:
         return False, f"Command timed out: {' '.join(command)}"
     except Exception as e:
@@ -77,7 +101,8 @@ def check_node_version() -> bool:
     """Check if Node.js is installed and version 16+"""
     print_step("Checking Node.js version...")
     
-    success, output = run_command(['node', '--version'], "Check Node.js version", check=False)
+    success, output = run_command(['node', '--version'], "Check Node.js version",
+                                  check=False, stream=False)
     
     if not success:
         print_warning("Node.js not found. Please install Node.js 16+ from https://nodejs.org")
@@ -104,7 +129,8 @@ def install_python_dependencies() -> bool:
     print_step("Installing Python dependencies...")
     
     # Check if uv is available
-    uv_available, _ = run_command(['uv', '--version'], "Check uv availability", check=False)
+    uv_available, _ = run_command(['uv', '--version'], "Check uv availability",
+                                  check=False, stream=False)
     
     if uv_available:
         print_step("Using uv for Python package management...")
@@ -255,20 +281,56 @@ def make_scripts_executable() -> bool:
     return True
 
 
+def dependency_python() -> str:
+    """The interpreter install_python_dependencies installs into
+    
+    uv installs into the project's .venv; pip into the running interpreter.
+    """
+    if shutil.which('uv'):
+        venv_python = Path(".venv") / ("Scripts/python.exe" if os.name == 'nt' else "bin/python")
+        if venv_python.exists():
+            return str(venv_python)
+    return sys.executable
+
+
+def build_solution_kernels() -> bool:
+    """Ahead-of-time compile solution kernels (optional, needs numba)"""
+    build_script = Path("solutions/python/_rna_kernel_build.py")
+    if not build_script.exists():
+        return True
+    
+    # numba is an optional extra (pip install .[fast]); without it the
+    # solutions run as plain Python and there's nothing to build
+    python = dependency_python()
+    numba_available, _ = run_command([python, '-c', 'import numba'], "Check numba availability",
+                                     check=False, stream=False)
+    if not numba_available:
+        return True
+    
+    print_step("Compiling solution kernels...")
+    success, output = run_command([python, str(build_script)], "Compile RNA folding kernel",
+                                  stream=False)
+    if success:
+        print_success("Solution kernels compiled ✓")
+    else:
+        print_warning(f"Could not compile solution kernels, falling back to JIT: {output}")
+    return success
+
+
 def verify_installation() -> bool:
     """Verify that the installation works"""
     print_step("Verifying installation...")
     
     # Test Python CLI
     success, output = run_command([sys.executable, 'tools/problem_manager.py', '--help'], 
-                                "Test problem manager", check=False)
+                                "Test problem manager", check=False, stream=False)
     if not success:
         print_error("Problem manager CLI test failed")
         return False
     
     # Test TypeScript compilation
     success, output = run_command(['npx', 'tsc', '--noEmit'], 
-                                "Test TypeScript compilation", check=False)
+                                "Test TypeScript compilation", check=False, stream=False)
     if not success:
         print_warning("TypeScript compilation test failed (non-critical)")
     
@@ -341,18 +403,25 @@ def main():
     if not node_available:
         print_warning("Node.js not available - TypeScript features will be limited")
     
-    # Install dependencies
-    if not install_python_dependencies():
-        all_success = False
-    
-    if node_available and not install_node_dependencies():
-        print_warning("Node.js dependency installation failed - TypeScript features may not work")
+    # The installers run one after the other, since both stream their output
+    # to the terminal; the configuration steps only print whole lines, so
+    # they go alongside
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        env_file = executor.submit(setup_environment_file)
+        scripts = executor.submit(make_scripts_executable)
+        
+        if not install_python_dependencies():
+            all_success = False
+        else:
+            build_solution_kernels()
+        
+        if node_available and not install_node_dependencies():
+            print_warning("Node.js dependency installation failed - TypeScript features may not work")
     
-    # Setup configuration
-    if not setup_environment_file():
+    if not env_file.result():
         all_success = False
     
-    if not make_scripts_executable():
+    if not scripts.result():
         print_warning("Could not make scripts executable - you may need to use 'python script.py' instead of './script.py'")
     
     # Verify installation
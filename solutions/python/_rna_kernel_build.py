@@ -0,0 +1,34 @@
+"""
+Ahead-of-time build of the RNA folding kernel.
+
+Compiles the Numba kernel from rna-strand-folding-score.py into a
+_rna_kernel extension module next to this file, so importing the solution in
+a fresh interpreter doesn't pay for JIT compilation. Requires Numba:
+
+    python solutions/python/_rna_kernel_build.py
+"""
+
+import importlib.util
+from pathlib import Path
+
+from numba.pycc import CC
+
+HERE = Path(__file__).parent
+
+
+def build() -> None:
+    """Compile _rna_kernel into this directory"""
+    spec = importlib.util.spec_from_file_location(
+        "rna_strand_folding_score", HERE / "rna-strand-folding-score.py"
+    )
+    solution = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(solution)
+
+    cc = CC('_rna_kernel')
+    cc.output_dir = str(HERE)
+    cc.export('nussinov', 'i8(i1[:], i2[:, :], i8)')(solution._nussinov_kernel.py_func)
+    cc.compile()
+
+
+if __name__ == "__main__":
+    build()
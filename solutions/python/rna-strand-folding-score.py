@@ -21,29 +21,99 @@ Examples:
 - AAUU → 2 (both A's pair with U's without crossing)
 """
 
-def maxRNAFoldingScore(sequence: str) -> int:
-    """
-    Calculate the maximum RNA folding score for a given sequence.
-    
-    Args:
-        sequence (str): RNA sequence containing only 'A', 'U', 'G', 'C'
+import bisect
+import functools
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    # Ahead-of-time build of _nussinov_kernel (see _rna_kernel_build.py);
+    # rebuild it after changing the kernel
+    from _rna_kernel import nussinov as _nussinov_aot
+except ImportError:
+    _nussinov_aot = None
+
+
+# A=0, U=1, G=2, C=3
+_BASES = 'AUGC'
+_TAB = str.maketrans(_BASES, '\x00\x01\x02\x03')
+
+# Valid base pairs
+_PAIR_SET = frozenset({('A', 'U'), ('U', 'A'), ('G', 'C'), ('C', 'G')})
+
+# Each base pairs with exactly one other, so the pure-Python path looks a
+# base's partner up instead of testing pairs
+_COMPLEMENT = dict(_PAIR_SET)
+
+# The whole pair table packed into 16 bits: bit (a << 2) | b is set when
+# encoded bases a and b can pair, so the compiled kernel tests a pair with
+# one shift-and-mask on an immediate instead of a table load
+_PAIR_MASK = sum(1 << ((_BASES.index(x) << 2) | _BASES.index(y)) for x, y in _PAIR_SET)
+
+if np is not None:
+    # _PAIR[a][b] == 1 when encoded bases a and b can pair
+    _PAIR = ((_PAIR_MASK >> np.arange(16)) & 1).astype(np.uint8).reshape(4, 4)
+
+
+def _dp_dtype(n: int):
+    """Smallest integer dtype that holds a score; scores never exceed n // 2."""
+    return np.int16 if n // 2 <= np.iinfo(np.int16).max else np.int32
+
+
+# Reused across calls so repeated scoring doesn't reallocate the DP table
+_DP_SCRATCH = None
+
+
+def _dp_buffer(size: int, dtype):
+    """Zeroed size x size DP table backed by the shared scratch buffer."""
+    global _DP_SCRATCH
+    if _DP_SCRATCH is None or _DP_SCRATCH.shape[0] < size or _DP_SCRATCH.dtype != dtype:
+        _DP_SCRATCH = np.zeros((size, size), dtype=dtype)
+        return _DP_SCRATCH
     
-    Returns:
-        int: Maximum possible folding score
-    """
+    dp = _DP_SCRATCH[:size, :size]
+    dp[...] = 0
+    return dp
+
+
+@functools.lru_cache(maxsize=128)
+def _encode(sequence: str):
+    """Encode a sequence as a read-only int8 array, or None if it has unknown bases."""
+    seq = np.frombuffer(sequence.translate(_TAB).encode(), dtype=np.int8)
+    if len(seq) != len(sequence) or (seq > 3).any():
+        return None
+    return seq
+
+
+def _nussinov_python(sequence: str) -> int:
+    """Pure-Python DP, used when NumPy/Numba are not installed."""
     n = len(sequence)
     
     # Initialize DP table with zeros
     # dp[i][j] represents max score for substring from i to j
     dp = [[0] * n for _ in range(n)]
+
+    # partners[i] lists every k > i that can pair with i, in increasing
+    # order, so the split loop below only visits k's that score. It is the
+    # tail of the complement's position list past i, so no pair is tested
+    positions = {}
+    for k, base in enumerate(sequence):
+        positions.setdefault(base, []).append(k)
     
-    # Helper function to check if two bases can pair
-    def can_pair(x: str, y: str) -> bool:
-        return (x == 'A' and y == 'U') or \
-               (x == 'U' and y == 'A') or \
-               (x == 'G' and y == 'C') or \
-               (x == 'C' and y == 'G')
-    
+    partners = []
+    for i, base in enumerate(sequence):
+        ks = positions.get(_COMPLEMENT.get(base), [])
+        partners.append(ks[bisect.bisect_right(ks, i):])
+
     # Fill DP table
     # l is the length of substring being considered
     for l in range(2, n + 1):
@@ -55,18 +125,163 @@ def maxRNAFoldingScore(sequence: str) -> int:
             dp[i][j] = dp[i + 1][j]
             
             # Case 2: Pair i with some position k where i < k <= j
-            for k in range(i + 1, j + 1):
-                if can_pair(sequence[i], sequence[k]):
-                    score = 1  # Score for pairing i with k
-                    if k < j:
-                        score += dp[k + 1][j]  # Add score for substring after k
-                    if i + 1 < k:
-                        score += dp[i + 1][k - 1]  # Add score for substring between i and k
-                    dp[i][j] = max(dp[i][j], score)
+            for k in partners[i]:
+                if k > j:
+                    break
+                score = 1  # Score for pairing i with k
+                if k < j:
+                    score += dp[k + 1][j]  # Add score for substring after k
+                if i + 1 < k:
+                    score += dp[i + 1][k - 1]  # Add score for substring between i and k
+                dp[i][j] = max(dp[i][j], score)
     
     return dp[0][n - 1]
 
 
+# Side of the square DP tiles the compiled kernel works through; a 64x64
+# int16 tile is 8 KB, so a tile and the rows/columns it reads stay in L1
+_TILE = 64
+
+
+if numba is not None:
+    @numba.njit(cache=True, boundscheck=False)
+    def _nussinov_kernel(seq, dp, n):
+        """Compiled DP fill over an int8-encoded sequence, one tile at a time.
+        
+        Column tiles are filled left to right and, within a column, bottom to
+        top; inside a tile rows go bottom to top and columns left to right.
+        Every cell read is then either in an earlier tile or earlier in the
+        same tile.
+        """
+        for jj in range(0, n, _TILE):
+            j_end = min(jj + _TILE, n)
+            for ii in range(jj, -1, -_TILE):
+                for i in range(min(ii + _TILE, n) - 1, ii - 1, -1):
+                    a = seq[i] << 2
+                    for j in range(max(jj, i + 1), j_end):
+                        best = dp[i + 1, j]
+                        for k in range(i + 1, j + 1):
+                            if (_PAIR_MASK >> (a | seq[k])) & 1:
+                                score = 1
+                                if k < j:
+                                    score += dp[k + 1, j]
+                                if i + 1 < k:
+                                    score += dp[i + 1, k - 1]
+                                if score > best:
+                                    best = score
+                        dp[i, j] = best
+        return dp[0, n - 1]
+
+
+    @numba.njit(cache=True, parallel=True)
+    def _nussinov_batch_kernel(seqs, dp, out):
+        """Run the tiled kernel over a batch of strands, one thread per strand."""
+        n = seqs.shape[1]
+        for b in numba.prange(seqs.shape[0]):
+            out[b] = _nussinov_kernel(seqs[b], dp[b], n)
+
+
+def _nussinov_numpy(seqs, dp):
+    """DP swept one anti-diagonal at a time with NumPy, for when Numba is missing.
+    
+    Works on a (B, n) batch of encoded strands at once; dp is a zeroed
+    (B, n + 1, n + 1) table. The extra row/column of zeros means dp[k + 1][j]
+    and dp[i + 1][k - 1] never need bounds checks, and the lower triangle
+    stays zero throughout.
+    """
+    n = seqs.shape[1]
+    
+    # pair[b][i][k] == 1 when bases i and k of strand b can pair
+    pair = _PAIR[seqs[:, :, None], seqs[:, None, :]].astype(dp.dtype)
+    
+    for l in range(2, n + 1):
+        i = np.arange(n - l + 1)
+        j = i + l - 1
+        
+        # Every split point k in (i, j] for every i on this diagonal at once
+        rows = i[:, None]
+        k = rows + np.arange(1, l)
+        scores = pair[:, rows, k] * (1 + dp[:, rows + 1, k - 1] + dp[:, k + 1, j[:, None]])
+        
+        dp[:, i, j] = np.maximum(dp[:, i + 1, j], scores.max(axis=2))
+    
+    return dp[:, 0, n - 1]
+
+
+@functools.lru_cache(maxsize=4096)
+def maxRNAFoldingScore(sequence: str) -> int:
+    """
+    Calculate the maximum RNA folding score for a given sequence.
+    
+    Scores are memoized per sequence, so re-scoring a strand is a dict
+    lookup; call maxRNAFoldingScore.cache_clear() to drop them.
+    
+    Time Complexity: O(n^3)
+    Space Complexity: O(n^2)
+    
+    Args:
+        sequence (str): RNA sequence containing only 'A', 'U', 'G', 'C'
+    
+    Returns:
+        int: Maximum possible folding score
+    """
+    n = len(sequence)
+    if n < 2:
+        return 0
+    
+    if np is None:
+        return _nussinov_python(sequence)
+    
+    seq = _encode(sequence)
+    if seq is None:
+        # Unknown bases never pair; keep the reference semantics for them
+        return _nussinov_python(sequence)
+    
+    dtype = _dp_dtype(n)
+    if _nussinov_aot is not None and dtype == np.int16:
+        return int(_nussinov_aot(seq, _dp_buffer(n, dtype), n))
+    
+    if numba is None:
+        return int(_nussinov_numpy(seq[None, :], _dp_buffer(n + 1, dtype)[None])[0])
+    
+    return int(_nussinov_kernel(seq, _dp_buffer(n, dtype), n))
+
+
+def maxRNAFoldingScoreBatch(sequences: List[str]) -> List[int]:
+    """
+    Score many RNA sequences of the same length in one call.
+    
+    With NumPy the strands are stacked into one (B, n) array and scored
+    together (in parallel threads when Numba is available); otherwise, or
+    when lengths differ or a strand has unknown bases, each sequence is
+    scored with maxRNAFoldingScore.
+    
+    Args:
+        sequences (List[str]): RNA sequences containing only 'A', 'U', 'G', 'C'
+    
+    Returns:
+        List[int]: Maximum folding score of each sequence, in input order
+    """
+    if not sequences:
+        return []
+    
+    n = len(sequences[0])
+    encoded = [_encode(s) for s in sequences] if np is not None and n >= 2 else None
+    if (encoded is None or any(len(s) != n for s in sequences)
+            or any(seq is None for seq in encoded)):
+        return [maxRNAFoldingScore(s) for s in sequences]
+    
+    seqs = np.stack(encoded)
+    dp = np.zeros((len(sequences), n + 1, n + 1), dtype=_dp_dtype(n))
+    
+    if numba is None:
+        return _nussinov_numpy(seqs, dp).tolist()
+    
+    out = np.zeros(len(sequences), dtype=np.int64)
+    _nussinov_batch_kernel(seqs, dp, out)
+    return out.tolist()
+
+
 # Test cases
 def test_maxRNAFoldingScore():
     """Test the RNA folding score function"""
@@ -98,6 +313,51 @@ def test_maxRNAFoldingScore():
     print("All tests passed!")
 
 
+def test_maxRNAFoldingScore_matches_reference():
+    """The optimized paths must agree with the plain DP"""
+    import random
+    
+    rng = random.Random(0)
+    for n in [1, 2, 3, 17, 64, 150]:
+        seq = ''.join(rng.choice('AUGC') for _ in range(n))
+        assert maxRNAFoldingScore(seq) == _nussinov_python(seq)
+        if np is not None:
+            dp = np.zeros((1, n + 1, n + 1), dtype=np.int16)
+            assert _nussinov_numpy(_encode(seq)[None, :], dp)[0] == _nussinov_python(seq)
+    
+    # Shorter calls after longer ones reuse (and re-zero) the scratch buffer
+    maxRNAFoldingScore.cache_clear()
+    for seq in ["GGGGCCCC" * 8, "AUGC", "GGGGCCCC"]:
+        assert maxRNAFoldingScore(seq) == _nussinov_python(seq)
+    
+    # Characters outside the alphabet never pair
+    assert maxRNAFoldingScore("AXU") == _nussinov_python("AXU") == 1
+    
+    # Repeat calls are answered from the cache
+    maxRNAFoldingScore.cache_clear()
+    maxRNAFoldingScore("GCAUGCAU")
+    assert maxRNAFoldingScore("GCAUGCAU") == 4
+    assert maxRNAFoldingScore.cache_info().hits == 1
+
+
+def test_maxRNAFoldingScoreBatch():
+    """Batch scoring matches scoring each sequence on its own"""
+    import random
+    
+    rng = random.Random(1)
+    batch = [''.join(rng.choice('AUGC') for _ in range(40)) for _ in range(6)]
+    assert maxRNAFoldingScoreBatch(batch) == [_nussinov_python(s) for s in batch]
+    
+    if np is not None:
+        dp = np.zeros((len(batch), 41, 41), dtype=np.int16)
+        seqs = np.stack([_encode(s) for s in batch])
+        assert _nussinov_numpy(seqs, dp).tolist() == [_nussinov_python(s) for s in batch]
+    
+    # Mixed lengths and unknown bases fall back to per-sequence scoring
+    assert maxRNAFoldingScoreBatch(["AUUGC", "GCAU", "AXU", "A"]) == [2, 2, 1, 0]
+    assert maxRNAFoldingScoreBatch([]) == []
+
+
 if __name__ == "__main__":
     test_maxRNAFoldingScore()
     
@@ -97,6 +97,19 @@ class TestSolution:
         target = -8
         result = self.solution.twoSum(nums, target)
         assert result == [2, 4]  # -3 + -5 = -8
+    
+    def test_large_input(self):
+        nums = list(range(0, 4096, 2))
+        nums[100], nums[-1] = -7, 10**9
+        target = 10**9 - 7
+        result = self.solution.twoSum(nums, target)
+        assert result == [100, len(nums) - 1]
+    
+    def test_large_input_duplicate_values(self):
+        nums = [1] * 2048
+        nums[5] = nums[900] = 50
+        result = self.solution.twoSum(nums, 100)
+        assert result == [5, 900]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tools import claude_worker
+
+
+class FakeHelper:
+    """Stands in for ClaudeHelper; an empty hint is how a failed API call comes back"""
+
+    def get_hint(self, problem, level):
+        return ""
+
+    def explain_concept(self, topic, context):
+        return f"About {topic}"
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(claude_worker, 'ClaudeHelper', FakeHelper)
+
+    def run(*lines):
+        stdout = io.StringIO()
+        claude_worker.serve(io.StringIO("\n".join(lines) + "\n"), stdout)
+        return [json.loads(reply) for reply in stdout.getvalue().splitlines()]
+
+    return run
+
+
+def test_malformed_requests_get_error_replies(serve):
+    replies = serve(
+        'not json',
+        '[1]',
+        '"hint"',
+        '{"cmd": "nope"}',
+        '{"cmd": "review", "problem": "two-sum", "file": "solutions"}',
+        '{"cmd": "explain"}',
+        '{"cmd": "explain", "topic": "heaps"}',
+    )
+
+    assert [reply['ok'] for reply in replies] == [False] * 6 + [True]
+    assert all(reply['error'] for reply in replies[:6])
+    assert replies[-1]['output'] == "About heaps"
+
+
+def test_empty_helper_result_is_an_error(serve):
+    replies = serve('{"cmd": "hint", "problem": "two-sum"}', '{"cmd": "stats"}')
+
+    assert replies[0]['ok'] is False
+    assert replies[1]['stats']['errors'] == 1
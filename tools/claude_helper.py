@@ -5,93 +5,148 @@ Uses OpenRouter API to access Claude for solutions, hints, and code review.
 """
 
 import os
-import json
-import requests
+import random
+import re
+import functools
+import hashlib
+import threading
+import time
+import zlib
+import orjson
 import click
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Mapping, Optional, Tuple, Any
+from collections import OrderedDict, deque
+from concurrent.futures import Future
 from dataclasses import dataclass
+from functools import cached_property
 from datetime import datetime
 import sys
 from dotenv import load_dotenv
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Imported where they are used: they're the bulk of this module's import
+# time, and commands like --help never need them
+if TYPE_CHECKING:
+    import asyncio
+    import requests
+
 # Load environment variables from .env file
 load_dotenv()
 
 # Add the project root to Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
-@dataclass
-class ProblemContext:
-    """Context about a LeetCode problem"""
-    title: str
-    difficulty: str
-    description: str
-    examples: List[Dict]
-    constraints: List[str]
-    topics: List[str]
-    
+from tools.file_utils import write_atomic
 
-class ClaudeHelper:
-    """Helper class for interacting with Claude via OpenRouter"""
-    
-    def __init__(self):
-        self.api_key = os.getenv('OPENROUTER_API_KEY')
-        self.api_url = os.getenv('OPENROUTER_API_URL', 'https://openrouter.ai/api/v1/chat/completions')
-        self.model = os.getenv('CLAUDE_MODEL', 'anthropic/claude-3.5-sonnet')
-        
-        if not self.api_key:
-            raise ValueError("OPENROUTER_API_KEY environment variable is required")
-    
-    def _make_request(self, messages: List[Dict], temperature: float = 0.7) -> str:
-        """Make a request to the OpenRouter API"""
-        headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json',
-            'HTTP-Referer': 'https://github.com/your-repo',  # Optional
-            'X-Title': 'LeetCode Practice Helper'  # Optional
-        }
-        
-        payload = {
-            'model': self.model,
-            'messages': messages,
-            'temperature': temperature,
-            'max_tokens': 2000
-        }
-        
-        try:
-            response = requests.post(self.api_url, headers=headers, json=payload)
-            response.raise_for_status()
+# Most requests a batch keeps in flight at once
+MAX_CONCURRENCY = 32
+
+# Shared by every ClaudeHelper so back-to-back requests reuse a pooled
+# keep-alive connection instead of paying a new TCP + TLS handshake
+_SESSION: Optional['requests.Session'] = None
+_session_lock = threading.Lock()
+
+
+def _shared_session() -> 'requests.Session':
+    """The pooled session, created on first use"""
+    global _SESSION
+    with _session_lock:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
             
-            result = response.json()
-            return result['choices'][0]['message']['content']
-        
-        except requests.exceptions.RequestException as e:
-            click.echo(f"❌ API request failed: {e}", err=True)
-            return ""
-        except (KeyError, IndexError) as e:
-            click.echo(f"❌ Unexpected API response format: {e}", err=True)
-            return ""
+            session = requests.Session()
+            # Room to keep every connection a full batch opens: a pool smaller
+            # than the batch drops the extras, and each later request that
+            # needs one repeats the handshake
+            session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENCY))
+            _SESSION = session
+    return _SESSION
+
+
+# (connect, read) timeouts in seconds; long completions can take a while
+REQUEST_TIMEOUT = (5, 120)
+
+# Transient failures are retried with exponential backoff and jitter
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_ATTEMPTS = 6
+
+# Average seconds per response that batches aim to stay under; full
+# solutions of up to 2000 tokens routinely take 10-20s
+TARGET_LATENCY = float(os.getenv('CLAUDE_TARGET_LATENCY', '30'))
+
+# Responses are cached on disk by request payload, so repeating a request
+# answers instantly without spending tokens
+CACHE_DIR = Path(os.getenv('CLAUDE_CACHE_DIR', '~/.cache/claude_helper')).expanduser()
+
+# Whitespace that doesn't change a prompt's meaning, dropped from cache keys
+_TRAILING_SPACE = re.compile(r'[ \t]+$', re.MULTILINE)
+_BLANK_LINES = re.compile(r'\n{3,}')
+
+
+def _normalize_prompt(text: str) -> str:
+    """Canonical form of a prompt for its cache key
     
-    def get_solution(self, problem: ProblemContext, language: str = "python", 
-                    approach: str = "optimal") -> str:
-        """Get a complete solution for a problem"""
-        
-        prompt = f'''
+    Line endings, trailing spaces, runs of blank lines and surrounding
+    whitespace are normalized. Indentation and case are kept, since the code
+    in review and debug prompts depends on them.
+    """
+    text = _TRAILING_SPACE.sub('', text.replace('\r\n', '\n'))
+    return _BLANK_LINES.sub('\n\n', text).strip()
+
+
+# Cache entries are compressed: with zstandard when it is installed, otherwise
+# zlib. Each entry is identified by its leading bytes when read back
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def _compress(data: bytes) -> bytes:
+    """Compress a cache entry"""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(data: bytes) -> bytes:
+    """Decompress a cache entry written by _compress"""
+    if data.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise ValueError("cache entry needs zstandard to read")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+# The most recently used responses, kept in memory in front of the disk cache
+_MEMORY_CACHE: 'OrderedDict[str, str]' = OrderedDict()
+_MEMORY_CACHE_SIZE = 128
+_memory_cache_lock = threading.Lock()
+
+# Cached requests currently being sent, by cache key: a concurrent identical
+# request waits for the first one's response instead of sending its own
+_IN_FLIGHT: Dict[str, 'Future[str]'] = {}
+_in_flight_lock = threading.Lock()
+
+# Prompt templates, filled in with str.format (literal braces are doubled)
+_SOLUTION_PROMPT = '''
 Please provide a {approach} solution for this LeetCode problem in {language}:
 
-**Problem:** {problem.title}
-**Difficulty:** {problem.difficulty}
-**Topics:** {", ".join(problem.topics)}
+**Problem:** {title}
+**Difficulty:** {difficulty}
+**Topics:** {topics}
 
 **Description:**
-{problem.description}
+{description}
 
 **Examples:**
-{self._format_examples(problem.examples)}
+{examples}
 
 **Constraints:**
-{self._format_constraints(problem.constraints)}
+{constraints}
 
 Please provide:
 1. A complete, working solution
@@ -101,49 +156,30 @@ Please provide:
 
 Format the code with proper comments and follow best practices for {language}.
 '''
-        
-        messages = [
-            {"role": "user", "content": prompt}
-        ]
-        
-        return self._make_request(messages)
-    
-    def get_hint(self, problem: ProblemContext, hint_level: str = "subtle") -> str:
-        """Get a progressive hint for a problem"""
-        
-        hint_prompts = {
-            "subtle": "Give me a very subtle hint that points me in the right direction without giving away the solution.",
-            "medium": "Give me a more concrete hint about the approach or data structure I should consider.",
-            "strong": "Give me a detailed hint that explains the approach but still leaves the implementation to me."
-        }
-        
-        prompt = f'''
+
+_HINT_PROMPT = '''
 I'm working on this LeetCode problem and need a {hint_level} hint:
 
-**Problem:** {problem.title}
-**Difficulty:** {problem.difficulty}
-**Description:** {problem.description}
+**Problem:** {title}
+**Difficulty:** {difficulty}
+**Description:** {description}
 
-{hint_prompts.get(hint_level, hint_prompts["subtle"])}
+{request}
 
 Please don't give me the complete solution - I want to figure it out myself!
 '''
-        
-        messages = [
-            {"role": "user", "content": prompt}
-        ]
-        
-        return self._make_request(messages, temperature=0.5)
-    
-    def review_solution(self, problem: ProblemContext, solution_code: str, 
-                       language: str = "python") -> str:
-        """Get feedback on an existing solution"""
-        
-        prompt = f'''
+
+_HINT_LEVELS = {
+    "subtle": "Give me a very subtle hint that points me in the right direction without giving away the solution.",
+    "medium": "Give me a more concrete hint about the approach or data structure I should consider.",
+    "strong": "Give me a detailed hint that explains the approach but still leaves the implementation to me."
+}
+
+_REVIEW_PROMPT = '''
 Please review my solution for this LeetCode problem:
 
-**Problem:** {problem.title}
-**Difficulty:** {problem.difficulty}
+**Problem:** {title}
+**Difficulty:** {difficulty}
 
 **My Solution ({language}):**
 ```{language}
@@ -160,20 +196,11 @@ Please provide:
 
 Be constructive and educational in your feedback.
 '''
-        
-        messages = [
-            {"role": "user", "content": prompt}
-        ]
-        
-        return self._make_request(messages)
-    
-    def explain_concept(self, topic: str, context: str = "") -> str:
-        """Explain a concept or algorithm"""
-        
-        prompt = f'''
+
+_EXPLAIN_PROMPT = '''
 Please explain the concept/algorithm: {topic}
 
-{f"Context: {context}" if context else ""}
+{context}
 
 Please provide:
 1. Clear explanation of the concept
@@ -185,30 +212,20 @@ Please provide:
 
 Keep it educational and easy to understand.
 '''
-        
-        messages = [
-            {"role": "user", "content": prompt}
-        ]
-        
-        return self._make_request(messages)
-    
-    def debug_solution(self, problem: ProblemContext, solution_code: str, 
-                      language: str = "python", error_msg: str = "") -> str:
-        """Help debug a solution that isn't working"""
-        
-        prompt = f'''
+
+_DEBUG_PROMPT = '''
 I'm having trouble with my solution for this problem. Can you help me debug it?
 
-**Problem:** {problem.title}
-**Difficulty:** {problem.difficulty}
-**Description:** {problem.description}
+**Problem:** {title}
+**Difficulty:** {difficulty}
+**Description:** {description}
 
 **My Code ({language}):**
 ```{language}
 {solution_code}
 ```
 
-{f"**Error I'm getting:** {error_msg}" if error_msg else ""}
+{error}
 
 Please help me:
 1. Identify what might be wrong with my approach
@@ -219,51 +236,32 @@ Please help me:
 
 Be encouraging and educational - help me learn from this debugging process!
 '''
-        
-        messages = [
-            {"role": "user", "content": prompt}
-        ]
-        
-        return self._make_request(messages)
-    
-    def get_pseudocode(self, problem: ProblemContext, detail_level: str = "high-level") -> str:
-        """Generate pseudocode for the problem approach"""
-        
-        level_prompts = {
-            "high-level": "Provide high-level pseudocode that outlines the main approach and key steps.",
-            "detailed": "Provide detailed pseudocode with more specific steps and logic.",
-            "implementation": "Provide implementation-ready pseudocode that's almost like real code."
-        }
-        
-        prompt = f'''
+
+_PSEUDOCODE_PROMPT = '''
 I understand the problem but need help with the approach. Can you provide {detail_level} pseudocode?
 
-**Problem:** {problem.title}
-**Description:** {problem.description}
+**Problem:** {title}
+**Description:** {description}
 
 **Examples:**
-{self._format_examples(problem.examples)}
+{examples}
 
-{level_prompts.get(detail_level, level_prompts["high-level"])}
+{request}
 
 Don't give me the full implementation - I want to code it myself. Just help me structure the approach!
 '''
-        
-        messages = [
-            {"role": "user", "content": prompt}
-        ]
-        
-        return self._make_request(messages)
-    
-    def walkthrough_test_case(self, problem: ProblemContext, test_case: str = "") -> str:
-        """Walk through a test case step by step"""
-        
-        if test_case:
-            prompt = f'''
+
+_PSEUDOCODE_LEVELS = {
+    "high-level": "Provide high-level pseudocode that outlines the main approach and key steps.",
+    "detailed": "Provide detailed pseudocode with more specific steps and logic.",
+    "implementation": "Provide implementation-ready pseudocode that's almost like real code."
+}
+
+_WALKTHROUGH_CASE_PROMPT = '''
 Can you walk me through this specific test case step by step?
 
-**Problem:** {problem.title}
-**Description:** {problem.description}
+**Problem:** {title}
+**Description:** {description}
 
 **Test case to analyze:** {test_case}
 
@@ -275,15 +273,15 @@ Please trace through:
 
 Help me understand the logic flow!
 '''
-        else:
-            prompt = f'''
+
+_WALKTHROUGH_EXAMPLE_PROMPT = '''
 Can you walk me through one of the examples step by step?
 
-**Problem:** {problem.title}
-**Description:** {problem.description}
+**Problem:** {title}
+**Description:** {description}
 
 **Examples:**
-{self._format_examples(problem.examples)}
+{examples}
 
 Pick one example and trace through:
 1. What the input represents
@@ -293,25 +291,16 @@ Pick one example and trace through:
 
 Help me understand the logic flow!
 '''
-        
-        messages = [
-            {"role": "user", "content": prompt}
-        ]
-        
-        return self._make_request(messages)
-    
-    def get_stuck_help(self, problem: ProblemContext, what_tried: str = "") -> str:
-        """Get help when completely stuck on a problem"""
-        
-        prompt = f'''
+
+_STUCK_PROMPT = '''
 I'm completely stuck on this problem and need help getting unstuck.
 
-**Problem:** {problem.title}
-**Difficulty:** {problem.difficulty}
-**Topics:** {", ".join(problem.topics)}
-**Description:** {problem.description}
+**Problem:** {title}
+**Difficulty:** {difficulty}
+**Topics:** {topics}
+**Description:** {description}
 
-{f"**What I've tried so far:** {what_tried}" if what_tried else ""}
+{what_tried}
 
 I'm not looking for the complete solution, but I need help:
 1. Understanding what approach to take
@@ -321,21 +310,8 @@ I'm not looking for the complete solution, but I need help:
 
 Please guide me step by step to help me think through this problem!
 '''
-        
-        messages = [
-            {"role": "user", "content": prompt}
-        ]
-        
-        return self._make_request(messages)
-    
-    def generate_problem(self, difficulty: str = "medium", topics: List[str] = None, 
-                        style: str = "leetcode", similar_to: str = "") -> Dict[str, Any]:
-        """Generate a new practice problem using Claude"""
-        
-        topics_str = ", ".join(topics) if topics else "algorithms and data structures"
-        
-        if similar_to:
-            prompt = f'''
+
+_GENERATE_SIMILAR_PROMPT = '''
 Create a new {difficulty} difficulty coding problem similar in style and concept to "{similar_to}" but with a different scenario.
 
 The problem should focus on: {topics_str}
@@ -386,8 +362,8 @@ Requirements:
 
 Return ONLY the JSON object, no additional text.
 '''
-        else:
-            prompt = f'''
+
+_GENERATE_PROMPT = '''
 Create a new {difficulty} difficulty coding problem for practice.
 
 Topics to focus on: {topics_str}
@@ -439,23 +415,600 @@ Requirements:
 
 Return ONLY the JSON object, no additional text.
 '''
+
+_FIX_JSON_PROMPT = '''
+That response couldn't be used: {error}
+
+Reply with the corrected problem as a single valid JSON object with the structure requested above. Return ONLY the JSON object, no additional text.
+'''
+
+# What generate_problem needs from a generated problem
+_STRING_LIST = {'type': 'array', 'items': {'type': 'string'}}
+_PROBLEM_SCHEMA = {
+    'type': 'object',
+    'required': ['title', 'difficulty', 'topics', 'description'],
+    'properties': {
+        'title': {'type': 'string', 'minLength': 1},
+        'difficulty': {'type': 'string'},
+        'topics': _STRING_LIST,
+        'description': {'type': 'string'},
+        'examples': {'type': 'array', 'items': {'type': 'object'}},
+        'constraints': _STRING_LIST,
+        'hints': _STRING_LIST,
+        'followUp': _STRING_LIST,
+        'testCases': {'type': 'array', 'items': {'type': 'object'}},
+    },
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _problem_validator():
+    """The problem schema's validator, compiled on first use"""
+    import jsonschema
+    return jsonschema.Draft7Validator(_PROBLEM_SCHEMA)
+
+
+def _extract_json(text: str) -> Optional[str]:
+    """The first complete JSON object in text, skipping any prose around it"""
+    start = text.find('{')
+    if start == -1:
+        return None
+    
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _format_examples(examples: List[Dict]) -> str:
+    """Format examples for the prompt"""
+    return "\n".join(
+        f"Example {i}:\n"
+        f"Input: {example.get('input', '')}\n"
+        f"Output: {example.get('output', '')}\n"
+        + (f"Explanation: {example['explanation']}\n" if example.get('explanation') else "")
+        for i, example in enumerate(examples, 1)
+    )
+
+
+def _format_constraints(constraints: List[str]) -> str:
+    """Format constraints for the prompt"""
+    return "\n".join(f"• {constraint}" for constraint in constraints)
+
+
+@dataclass(frozen=True)
+class ProblemContext:
+    """Context about a LeetCode problem"""
+    title: str
+    difficulty: str
+    description: str
+    examples: List[Dict]
+    constraints: List[str]
+    topics: List[str]
+    
+    # Formatted once per problem and reused by every prompt built from it
+    @cached_property
+    def formatted_examples(self) -> str:
+        return _format_examples(self.examples)
+    
+    @cached_property
+    def formatted_constraints(self) -> str:
+        return _format_constraints(self.constraints)
+    
+
+class RateLimiter:
+    """Client-side sliding-window limit on requests and tokens per minute
+    
+    Keeps request bursts (e.g. ``batch``) under the provider's limits instead
+    of finding them through 429 responses, and backs off when the provider
+    reports that little of its own quota is left.
+    """
+    
+    WINDOW = 60.0
+    
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests: Deque[float] = deque()
+        self._tokens: Deque[Tuple[float, int]] = deque()
+        self._token_total = 0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self, estimated_tokens: int):
+        """Block until a request of about this many tokens fits in the window"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._requests and self._requests[0] <= now - self.WINDOW:
+                    self._requests.popleft()
+                while self._tokens and self._tokens[0][0] <= now - self.WINDOW:
+                    self._token_total -= self._tokens.popleft()[1]
+                
+                wait = self._paused_until - now
+                if len(self._requests) >= self.rpm:
+                    wait = max(wait, self._requests[0] + self.WINDOW - now)
+                if self._tokens and self._token_total + estimated_tokens > self.tpm:
+                    wait = max(wait, self._tokens[0][0] + self.WINDOW - now)
+                
+                if wait <= 0:
+                    self._requests.append(now)
+                    return
+            
+            time.sleep(wait)
+    
+    def record_tokens(self, tokens: int):
+        """Count the tokens a finished request actually used"""
+        with self._lock:
+            self._tokens.append((time.monotonic(), tokens))
+            self._token_total += tokens
+    
+    def observe_headers(self, headers: Mapping[str, str]):
+        """Pause new requests when the provider says its quota is nearly spent"""
+        remaining = headers.get('x-ratelimit-remaining-requests', headers.get('x-ratelimit-remaining'))
+        limit = headers.get('x-ratelimit-limit-requests', headers.get('x-ratelimit-limit'))
+        retry_after = headers.get('retry-after')
+        
+        try:
+            exhausted = remaining is not None and (
+                int(remaining) <= 2 or (limit is not None and int(remaining) < 0.1 * int(limit)))
+        except ValueError:
+            exhausted = False
+        
+        if not exhausted and retry_after is None:
+            return
+        
+        try:
+            pause = float(retry_after) if retry_after is not None else 1.0
+        except ValueError:
+            pause = 1.0
+        
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease limit on requests in flight
+    
+    While the average latency of recent requests stays at or under the
+    target the limit grows by ``alpha`` per completed request; a slow average
+    or a failed request multiplies it by ``beta``. Batches settle on the
+    highest concurrency the provider serves promptly and back off quickly
+    when it degrades.
+    """
+    
+    def __init__(self, initial: int, maximum: int, minimum: int = 1,
+                 alpha: float = 0.5, beta: float = 0.5,
+                 target_latency: float = TARGET_LATENCY,
+                 window: int = 20):
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.alpha = alpha
+        self.beta = beta
+        self.target_latency = target_latency
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._in_flight = 0
+        # Created on first use so it belongs to the running event loop
+        self._condition: Optional['asyncio.Condition'] = None
+    
+    async def acquire(self):
+        """Wait until another request fits under the current limit"""
+        if self._condition is None:
+            import asyncio
+            self._condition = asyncio.Condition()
+        
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+    
+    async def release(self, latency: float, ok: bool):
+        """Finish a request and adjust the limit from how it went"""
+        async with self._condition:
+            self._in_flight -= 1
+            
+            if ok:
+                self._latencies.append(latency)
+            
+            if ok and sum(self._latencies) / len(self._latencies) <= self.target_latency:
+                self.limit = min(self.maximum, self.limit + self.alpha)
+            else:
+                self.limit = max(self.minimum, self.limit * self.beta)
+            
+            self._condition.notify_all()
+
+
+# Shared by every ClaudeHelper, since the provider's limits are per API key
+_RATE_LIMITER = RateLimiter(int(os.getenv('OPENROUTER_RPM', '60')),
+                            int(os.getenv('OPENROUTER_TPM', '60000')))
+
+
+class ClaudeHelper:
+    """Helper class for interacting with Claude via OpenRouter"""
+    
+    def __init__(self, use_cache: bool = True, on_token: Optional[Callable[[str], None]] = None):
+        self.use_cache = use_cache
+        # When set, responses are streamed and each piece of text is passed
+        # to on_token as it arrives; the methods still return the full text
+        self.on_token = on_token
+        self.api_key = os.getenv('OPENROUTER_API_KEY')
+        self.api_url = os.getenv('OPENROUTER_API_URL', 'https://openrouter.ai/api/v1/chat/completions')
+        self.model = os.getenv('CLAUDE_MODEL', 'anthropic/claude-3.5-sonnet')
+        
+        if not self.api_key:
+            raise ValueError("OPENROUTER_API_KEY environment variable is required")
+        
+        self._session = _shared_session()
+        self._headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json',
+            'HTTP-Referer': 'https://github.com/your-repo',  # Optional
+            'X-Title': 'LeetCode Practice Helper'  # Optional
+        }
+    
+    def _make_request(self, messages: List[Dict], temperature: float = 0.7,
+                      max_tokens: int = 2000, is_usable: Optional[Callable[[str], bool]] = None) -> str:
+        """Make a request to the OpenRouter API
+        
+        max_tokens should fit the longest answer a method expects: an
+        oversized budget doesn't cost anything but is slower to schedule.
+        When is_usable is given, only responses it accepts are cached, so a
+        malformed answer isn't replayed on the next identical request.
+        """
+        payload = {
+            'model': self.model,
+            'messages': messages,
+            'temperature': temperature,
+            'max_tokens': max_tokens
+        }
+        
+        if not self.use_cache:
+            return self._fetch(payload, None, is_usable)
+        
+        normalized = [{**m, 'content': _normalize_prompt(m['content'])} for m in messages]
+        cache_key = hashlib.sha256(orjson.dumps({**payload, 'messages': normalized},
+                                                option=orjson.OPT_SORT_KEYS)).hexdigest()
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            if self.on_token:
+                self.on_token(cached)
+            return cached
+        
+        with _in_flight_lock:
+            pending = _IN_FLIGHT.get(cache_key)
+            if pending is None:
+                future = _IN_FLIGHT[cache_key] = Future()
+        
+        if pending is not None:
+            content = pending.result()
+            if self.on_token and content:
+                self.on_token(content)
+            return content
+        
+        content = ""
+        try:
+            content = self._fetch(payload, cache_key, is_usable)
+            return content
+        finally:
+            # _fetch has cached the response by now, so a request arriving
+            # after this finds it there
+            with _in_flight_lock:
+                del _IN_FLIGHT[cache_key]
+            future.set_result(content)
+    
+    def _fetch(self, payload: Dict[str, Any], cache_key: Optional[str],
+               is_usable: Optional[Callable[[str], bool]] = None) -> str:
+        """Send a request and cache its response, returning "" if it fails"""
+        import requests
+        
+        try:
+            if self.on_token:
+                content = self._stream(payload)
+            else:
+                response = self._post(payload)
+                response.raise_for_status()
+                
+                result = orjson.loads(response.content)
+                _RATE_LIMITER.record_tokens(result.get('usage', {}).get('total_tokens', 0))
+                content = result['choices'][0]['message']['content']
+            
+            if cache_key and content and (is_usable is None or is_usable(content)):
+                self._cache_put(cache_key, content)
+            return content
+        
+        except requests.exceptions.RequestException as e:
+            click.echo(f"❌ API request failed: {e}", err=True)
+            return ""
+        except (KeyError, IndexError, ValueError) as e:
+            click.echo(f"❌ Unexpected API response format: {e}", err=True)
+            return ""
+    
+    def _stream(self, payload: Dict[str, Any]) -> str:
+        """Make a streaming request, passing text to on_token as it arrives"""
+        parts = []
+        
+        with self._post({**payload, 'stream': True}, stream=True) as response:
+            response.raise_for_status()
+            
+            # Server-sent events: "data: {json}" lines, ": comment" keep-alives,
+            # and a final "data: [DONE]"
+            for line in response.iter_lines():
+                if not line.startswith(b'data: '):
+                    continue
+                data = line[len(b'data: '):]
+                if data == b'[DONE]':
+                    break
+                
+                chunk = orjson.loads(data)
+                if chunk.get('usage'):
+                    _RATE_LIMITER.record_tokens(chunk['usage'].get('total_tokens', 0))
+                if chunk.get('choices'):
+                    text = chunk['choices'][0].get('delta', {}).get('content') or ''
+                    if text:
+                        parts.append(text)
+                        self.on_token(text)
+        
+        return ''.join(parts)
+    
+    def _post(self, payload: Dict[str, Any], stream: bool = False) -> 'requests.Response':
+        """POST a payload, retrying rate limits, server errors and dropped connections"""
+        import requests
+        
+        # Roughly four characters per token for the prompt; the completion is
+        # counted from the reported usage once the response arrives
+        estimated_tokens = sum(len(m['content']) for m in payload['messages']) // 4
+        
+        for attempt in range(MAX_ATTEMPTS):
+            # Waits out any Retry-After the previous response asked for
+            _RATE_LIMITER.acquire(estimated_tokens)
+            
+            try:
+                response = self._session.post(self.api_url, headers=self._headers, json=payload,
+                                              timeout=REQUEST_TIMEOUT, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+            else:
+                _RATE_LIMITER.observe_headers(response.headers)
+                if response.status_code not in RETRY_STATUSES or attempt == MAX_ATTEMPTS - 1:
+                    return response
+                # Hand a streamed response's connection back to the pool before waiting
+                response.close()
+            
+            time.sleep(min(60, 2 ** attempt + random.uniform(0, 1)))
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look a response up in memory, then on disk"""
+        with _memory_cache_lock:
+            if key in _MEMORY_CACHE:
+                _MEMORY_CACHE.move_to_end(key)
+                return _MEMORY_CACHE[key]
+        
+        try:
+            content = _decompress((CACHE_DIR / key[:2] / f"{key}.cache").read_bytes()).decode('utf-8')
+        except (OSError, ValueError, zlib.error):
+            return None
+        
+        self._remember(key, content)
+        return content
+    
+    def _cache_put(self, key: str, content: str):
+        """Store a response in memory and on disk"""
+        self._remember(key, content)
+        
+        cache_file = CACHE_DIR / key[:2] / f"{key}.cache"
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(cache_file, _compress(content.encode('utf-8')))
+        except OSError as e:
+            click.echo(f"⚠️ Could not write response cache: {e}", err=True)
+    
+    @staticmethod
+    def _remember(key: str, content: str):
+        with _memory_cache_lock:
+            _MEMORY_CACHE[key] = content
+            _MEMORY_CACHE.move_to_end(key)
+            if len(_MEMORY_CACHE) > _MEMORY_CACHE_SIZE:
+                _MEMORY_CACHE.popitem(last=False)
+    
+    async def abatch(self, calls: List[Callable[[], str]], concurrency: int = 5,
+                     max_concurrency: int = MAX_CONCURRENCY) -> List[str]:
+        """Run several helper calls concurrently and return their results in order
+        
+        Each call is a blocking request such as
+        ``functools.partial(helper.get_hint, problem, "subtle")``. The batch
+        starts with ``concurrency`` calls in flight and an AIMDController
+        adjusts that between 1 and ``max_concurrency`` as responses arrive.
+        """
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        
+        loop = asyncio.get_running_loop()
+        controller = AIMDController(concurrency, max_concurrency)
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            async def bounded(call: Callable[[], str]) -> str:
+                await controller.acquire()
+                started = time.monotonic()
+                result = ""
+                try:
+                    result = await loop.run_in_executor(executor, call)
+                    return result
+                finally:
+                    # The helper methods return "" when a request fails
+                    await controller.release(time.monotonic() - started, bool(result))
+            
+            return await asyncio.gather(*(bounded(call) for call in calls))
+    
+    def get_solution(self, problem: ProblemContext, language: str = "python", 
+                    approach: str = "optimal") -> str:
+        """Get a complete solution for a problem"""
+        
+        prompt = _SOLUTION_PROMPT.format(
+            approach=approach, language=language, title=problem.title,
+            difficulty=problem.difficulty, topics=", ".join(problem.topics),
+            description=problem.description,
+            examples=problem.formatted_examples,
+            constraints=problem.formatted_constraints)
+        
+        messages = [
+            {"role": "user", "content": prompt}
+        ]
+        
+        return self._make_request(messages)
+    
+    def get_hint(self, problem: ProblemContext, hint_level: str = "subtle") -> str:
+        """Get a progressive hint for a problem"""
+        
+        prompt = _HINT_PROMPT.format(
+            hint_level=hint_level, title=problem.title, difficulty=problem.difficulty,
+            description=problem.description,
+            request=_HINT_LEVELS.get(hint_level, _HINT_LEVELS["subtle"]))
+        
+        messages = [
+            {"role": "user", "content": prompt}
+        ]
+        
+        return self._make_request(messages, temperature=0.5, max_tokens=500)
+    
+    def review_solution(self, problem: ProblemContext, solution_code: str, 
+                       language: str = "python") -> str:
+        """Get feedback on an existing solution"""
+        
+        prompt = _REVIEW_PROMPT.format(
+            title=problem.title, difficulty=problem.difficulty, language=language,
+            solution_code=solution_code)
         
         messages = [
             {"role": "user", "content": prompt}
         ]
         
+        return self._make_request(messages)
+    
+    def explain_concept(self, topic: str, context: str = "") -> str:
+        """Explain a concept or algorithm"""
+        
+        prompt = _EXPLAIN_PROMPT.format(
+            topic=topic, context=f"Context: {context}" if context else "")
+        
+        messages = [
+            {"role": "user", "content": prompt}
+        ]
+        
+        return self._make_request(messages, max_tokens=1200)
+    
+    def debug_solution(self, problem: ProblemContext, solution_code: str, 
+                      language: str = "python", error_msg: str = "") -> str:
+        """Help debug a solution that isn't working"""
+        
+        prompt = _DEBUG_PROMPT.format(
+            title=problem.title, difficulty=problem.difficulty,
+            description=problem.description, language=language, solution_code=solution_code,
+            error=f"**Error I'm getting:** {error_msg}" if error_msg else "")
+        
+        messages = [
+            {"role": "user", "content": prompt}
+        ]
+        
+        return self._make_request(messages)
+    
+    def get_pseudocode(self, problem: ProblemContext, detail_level: str = "high-level") -> str:
+        """Generate pseudocode for the problem approach"""
+        
+        prompt = _PSEUDOCODE_PROMPT.format(
+            detail_level=detail_level, title=problem.title, description=problem.description,
+            examples=problem.formatted_examples,
+            request=_PSEUDOCODE_LEVELS.get(detail_level, _PSEUDOCODE_LEVELS["high-level"]))
+        
+        messages = [
+            {"role": "user", "content": prompt}
+        ]
+        
+        return self._make_request(messages, max_tokens=800)
+    
+    def walkthrough_test_case(self, problem: ProblemContext, test_case: str = "") -> str:
+        """Walk through a test case step by step"""
+        
+        if test_case:
+            prompt = _WALKTHROUGH_CASE_PROMPT.format(
+                title=problem.title, description=problem.description, test_case=test_case)
+        else:
+            prompt = _WALKTHROUGH_EXAMPLE_PROMPT.format(
+                title=problem.title, description=problem.description,
+                examples=problem.formatted_examples)
+        
+        messages = [
+            {"role": "user", "content": prompt}
+        ]
+        
+        return self._make_request(messages, max_tokens=1200)
+    
+    def get_stuck_help(self, problem: ProblemContext, what_tried: str = "") -> str:
+        """Get help when completely stuck on a problem"""
+        
+        prompt = _STUCK_PROMPT.format(
+            title=problem.title, difficulty=problem.difficulty,
+            topics=", ".join(problem.topics), description=problem.description,
+            what_tried=f"**What I've tried so far:** {what_tried}" if what_tried else "")
+        
+        messages = [
+            {"role": "user", "content": prompt}
+        ]
+        
+        return self._make_request(messages, max_tokens=800)
+    
+    def generate_problem(self, difficulty: str = "medium", topics: List[str] = None, 
+                        style: str = "leetcode", similar_to: str = "") -> Dict[str, Any]:
+        """Generate a new practice problem using Claude"""
+        
+        topics_str = ", ".join(topics) if topics else "algorithms and data structures"
+        
+        if similar_to:
+            prompt = _GENERATE_SIMILAR_PROMPT.format(
+                difficulty=difficulty, similar_to=similar_to, topics_str=topics_str)
+        else:
+            prompt = _GENERATE_PROMPT.format(
+                difficulty=difficulty, topics_str=topics_str, style=style)
+        
+        messages = [
+            {"role": "user", "content": prompt}
+        ]
+        
+        def is_problem(response: str) -> bool:
+            return self._parse_problem(response)[1] is None
+        
         try:
-            response = self._make_request(messages, temperature=0.8)
-            
-            # Try to parse the JSON response
-            import json
-            problem_data = json.loads(response.strip())
+            response = self._make_request(messages, temperature=0.8, max_tokens=3000,
+                                          is_usable=is_problem)
+            problem_data, error = self._parse_problem(response)
             
-            # Validate required fields
-            required_fields = ['title', 'difficulty', 'topics', 'description']
-            for field in required_fields:
-                if field not in problem_data:
-                    raise ValueError(f"Missing required field: {field}")
+            if error and response:
+                # Ask for a corrected copy of the same problem rather than a new one
+                messages += [
+                    {"role": "assistant", "content": response},
+                    {"role": "user", "content": _FIX_JSON_PROMPT.format(error=error)},
+                ]
+                response = self._make_request(messages, temperature=0.2, max_tokens=3000,
+                                              is_usable=is_problem)
+                problem_data, error = self._parse_problem(response)
+            if error:
+                raise ValueError(error)
             
             # Set defaults for optional fields
             problem_data.setdefault('examples', [])
@@ -466,50 +1019,76 @@ Return ONLY the JSON object, no additional text.
             
             return problem_data
             
-        except json.JSONDecodeError as e:
-            click.echo(f"❌ Failed to parse Claude's response as JSON: {e}", err=True)
+        except ValueError as e:
+            click.echo(f"❌ Failed to parse Claude's response as a problem: {e}", err=True)
             click.echo(f"Raw response: {response[:200]}...", err=True)
             return {}
         except Exception as e:
             click.echo(f"❌ Error generating problem: {e}", err=True)
             return {}
     
-    def _format_examples(self, examples: List[Dict]) -> str:
-        """Format examples for the prompt"""
-        formatted = []
-        for i, example in enumerate(examples, 1):
-            formatted.append(f"Example {i}:")
-            formatted.append(f"Input: {example.get('input', '')}")
-            formatted.append(f"Output: {example.get('output', '')}")
-            if example.get('explanation'):
-                formatted.append(f"Explanation: {example['explanation']}")
-            formatted.append("")
-        return "\n".join(formatted)
-    
-    def _format_constraints(self, constraints: List[str]) -> str:
-        """Format constraints for the prompt"""
-        return "\n".join(f"• {constraint}" for constraint in constraints)
+    @staticmethod
+    def _parse_problem(response: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Pull the problem JSON out of a response, returning it with the reason it's unusable, if any"""
+        text = _extract_json(response)
+        if text is None:
+            return {}, "no JSON object found"
+        
+        try:
+            problem_data = orjson.loads(text)
+        except orjson.JSONDecodeError as e:
+            return {}, f"invalid JSON: {e}"
+        
+        errors = [
+            f"{'.'.join(map(str, error.absolute_path)) or 'problem'}: {error.message}"
+            for error in _problem_validator().iter_errors(problem_data)
+        ]
+        if errors:
+            return {}, "; ".join(errors)
+        return problem_data, None
+
+
+@functools.lru_cache(maxsize=1)
+def _problem_index() -> Dict[str, Path]:
+    """Map problem IDs to their JSON files with one scan of the difficulty directories"""
+    index = {}
+    # Hardest first, so an ID found in several directories resolves to the
+    # easiest one as the old per-directory search did
+    for difficulty in ['hard', 'medium', 'easy']:
+        for problem_file in Path(f"problems/{difficulty}").glob("*.json"):
+            index[problem_file.stem] = problem_file
+    return index
 
 
 def load_problem(problem_id: str) -> Optional[ProblemContext]:
     """Load problem data from JSON file"""
-    problem_file = None
+    data = None
     
-    # Search in all difficulty directories
-    for difficulty in ['easy', 'medium', 'hard']:
-        potential_file = Path(f"problems/{difficulty}/{problem_id}.json")
-        if potential_file.exists():
-            problem_file = potential_file
+    # A miss, or a file that has gone away, means problems were added, moved
+    # or deleted since the index was built; rescan once before giving up
+    for rescan in (False, True):
+        if rescan:
+            _problem_index.cache_clear()
+        
+        problem_file = _problem_index().get(problem_id)
+        if problem_file is None:
+            continue
+        
+        try:
+            # orjson parses the raw bytes, skipping a separate decode to str
+            data = orjson.loads(problem_file.read_bytes())
             break
+        except FileNotFoundError:
+            continue
+        except orjson.JSONDecodeError as e:
+            click.echo(f"❌ Error loading problem file: {e}", err=True)
+            return None
     
-    if not problem_file:
+    if data is None:
         click.echo(f"❌ Problem '{problem_id}' not found", err=True)
         return None
     
     try:
-        with open(problem_file, 'r') as f:
-            data = json.load(f)
-        
         return ProblemContext(
             title=data['title'],
             difficulty=data['difficulty'],
@@ -518,15 +1097,47 @@ def load_problem(problem_id: str) -> Optional[ProblemContext]:
             constraints=data.get('constraints', []),
             topics=data.get('topics', [])
         )
-    except (json.JSONDecodeError, KeyError) as e:
+    except KeyError as e:
         click.echo(f"❌ Error loading problem file: {e}", err=True)
         return None
 
 
+def _echo_stream(heading: str) -> Callable[[str], None]:
+    """on_token callback that prints a section heading, then text as it arrives"""
+    started = False
+    
+    def on_token(text: str):
+        nonlocal started
+        if not started:
+            click.echo("\n" + "="*60)
+            click.echo(heading)
+            click.echo("="*60)
+            started = True
+        click.echo(text, nl=False)
+    
+    return on_token
+
+
+def _helper(ctx: click.Context, use_cache: bool = True,
+            on_token: Optional[Callable[[str], None]] = None) -> ClaudeHelper:
+    """The ClaudeHelper shared by this invocation's commands, set up for the caller
+    
+    It's created on first use, so --help and commands that fail before
+    making a request don't need an API key.
+    """
+    helper = ctx.obj.get('helper')
+    if helper is None:
+        helper = ctx.obj['helper'] = ClaudeHelper()
+    helper.use_cache = use_cache
+    helper.on_token = on_token
+    return helper
+
+
 @click.group()
-def cli():
+@click.pass_context
+def cli(ctx: click.Context):
     """Claude Helper - AI assistance for LeetCode practice"""
-    pass
+    ctx.ensure_object(dict)
 
 
 @cli.command()
@@ -537,7 +1148,8 @@ def cli():
 @click.option('--approach', '-a', default='optimal',
               type=click.Choice(['brute-force', 'optimal', 'multiple']),
               help='Solution approach')
-def solve(problem: str, language: str, approach: str):
+@click.pass_context
+def solve(ctx: click.Context, problem: str, language: str, approach: str):
     """Get a complete solution for a problem"""
     
     problem_context = load_problem(problem)
@@ -546,14 +1158,11 @@ def solve(problem: str, language: str, approach: str):
     
     click.echo(f"🤖 Getting {approach} {language} solution for '{problem_context.title}'...")
     
-    helper = ClaudeHelper()
+    helper = _helper(ctx, on_token=_echo_stream("🎯 SOLUTION"))
     solution = helper.get_solution(problem_context, language, approach)
     
     if solution:
-        click.echo("\n" + "="*60)
-        click.echo("🎯 SOLUTION")
-        click.echo("="*60)
-        click.echo(solution)
+        click.echo()
         
         # Optionally save to file
         if click.confirm("\n💾 Save solution to file?"):
@@ -565,7 +1174,9 @@ def solve(problem: str, language: str, approach: str):
 @click.option('--level', '-l', default='subtle',
               type=click.Choice(['subtle', 'medium', 'strong']),
               help='Hint level')
-def hint(problem: str, level: str):
+@click.option('--no-cache', is_flag=True, help='Ask for a fresh hint instead of a cached one')
+@click.pass_context
+def hint(ctx: click.Context, problem: str, level: str, no_cache: bool):
     """Get a progressive hint for a problem"""
     
     problem_context = load_problem(problem)
@@ -574,14 +1185,9 @@ def hint(problem: str, level: str):
     
     click.echo(f"💡 Getting {level} hint for '{problem_context.title}'...")
     
-    helper = ClaudeHelper()
-    hint_text = helper.get_hint(problem_context, level)
-    
-    if hint_text:
-        click.echo("\n" + "="*60)
-        click.echo("💡 HINT")
-        click.echo("="*60)
-        click.echo(hint_text)
+    helper = _helper(ctx, use_cache=not no_cache, on_token=_echo_stream("💡 HINT"))
+    if helper.get_hint(problem_context, level):
+        click.echo()
 
 
 @cli.command()
@@ -590,7 +1196,8 @@ def hint(problem: str, level: str):
               type=click.Choice(['python', 'typescript']),
               help='Programming language')
 @click.option('--file', '-f', help='Solution file to review (optional)')
-def review(problem: str, language: str, file: Optional[str]):
+@click.pass_context
+def review(ctx: click.Context, problem: str, language: str, file: Optional[str]):
     """Review your solution and get feedback"""
     
     problem_context = load_problem(problem)
@@ -618,7 +1225,7 @@ def review(problem: str, language: str, file: Optional[str]):
     
     click.echo(f"🔍 Reviewing your {language} solution for '{problem_context.title}'...")
     
-    helper = ClaudeHelper()
+    helper = _helper(ctx)
     review_text = helper.review_solution(problem_context, solution_code, language)
     
     if review_text:
@@ -631,19 +1238,15 @@ def review(problem: str, language: str, file: Optional[str]):
 @cli.command()
 @click.option('--topic', '-t', required=True, help='Topic or concept to explain')
 @click.option('--context', '-c', help='Additional context')
-def explain(topic: str, context: Optional[str]):
+@click.pass_context
+def explain(ctx: click.Context, topic: str, context: Optional[str]):
     """Explain a concept or algorithm"""
     
     click.echo(f"📚 Explaining: {topic}")
     
-    helper = ClaudeHelper()
-    explanation = helper.explain_concept(topic, context or "")
-    
-    if explanation:
-        click.echo("\n" + "="*60)
-        click.echo("📚 EXPLANATION")
-        click.echo("="*60)
-        click.echo(explanation)
+    helper = _helper(ctx, on_token=_echo_stream("📚 EXPLANATION"))
+    if helper.explain_concept(topic, context or ""):
+        click.echo()
 
 
 @cli.command()
@@ -652,7 +1255,8 @@ def explain(topic: str, context: Optional[str]):
               type=click.Choice(['python', 'typescript']),
               help='Programming language')
 @click.option('--error', '-e', help='Error message you\'re getting')
-def debug(problem: str, language: str, error: Optional[str]):
+@click.pass_context
+def debug(ctx: click.Context, problem: str, language: str, error: Optional[str]):
     """🐛 Get help debugging your solution"""
     
     problem_context = load_problem(problem)
@@ -677,7 +1281,7 @@ def debug(problem: str, language: str, error: Optional[str]):
     
     click.echo(f"🐛 Debugging your {language} solution for '{problem_context.title}'...")
     
-    helper = ClaudeHelper()
+    helper = _helper(ctx)
     debug_help = helper.debug_solution(problem_context, solution_code, language, error or "")
     
     if debug_help:
@@ -692,7 +1296,8 @@ def debug(problem: str, language: str, error: Optional[str]):
 @click.option('--approach', '-a', default='high-level',
               type=click.Choice(['high-level', 'detailed', 'implementation']),
               help='Level of pseudocode detail')
-def pseudocode(problem: str, approach: str):
+@click.pass_context
+def pseudocode(ctx: click.Context, problem: str, approach: str):
     """📝 Get pseudocode for the approach"""
     
     problem_context = load_problem(problem)
@@ -701,7 +1306,7 @@ def pseudocode(problem: str, approach: str):
     
     click.echo(f"📝 Generating {approach} pseudocode for '{problem_context.title}'...")
     
-    helper = ClaudeHelper()
+    helper = _helper(ctx)
     pseudo = helper.get_pseudocode(problem_context, approach)
     
     if pseudo:
@@ -714,7 +1319,8 @@ def pseudocode(problem: str, approach: str):
 @cli.command()
 @click.option('--problem', '-p', required=True, help='Problem ID')
 @click.option('--test-case', '-t', help='Specific test case to analyze')
-def walkthrough(problem: str, test_case: Optional[str]):
+@click.pass_context
+def walkthrough(ctx: click.Context, problem: str, test_case: Optional[str]):
     """🚶 Walk through a test case step by step"""
     
     problem_context = load_problem(problem)
@@ -723,7 +1329,7 @@ def walkthrough(problem: str, test_case: Optional[str]):
     
     click.echo(f"🚶 Walking through test case for '{problem_context.title}'...")
     
-    helper = ClaudeHelper()
+    helper = _helper(ctx)
     walkthrough_text = helper.walkthrough_test_case(problem_context, test_case or "")
     
     if walkthrough_text:
@@ -736,7 +1342,8 @@ def walkthrough(problem: str, test_case: Optional[str]):
 @cli.command()
 @click.option('--problem', '-p', required=True, help='Problem ID')
 @click.option('--what-tried', '-w', help='What approaches you\'ve already tried')
-def stuck(problem: str, what_tried: Optional[str]):
+@click.pass_context
+def stuck(ctx: click.Context, problem: str, what_tried: Optional[str]):
     """🆘 Get help when completely stuck"""
     
     problem_context = load_problem(problem)
@@ -745,7 +1352,7 @@ def stuck(problem: str, what_tried: Optional[str]):
     
     click.echo(f"🆘 Getting unstuck help for '{problem_context.title}'...")
     
-    helper = ClaudeHelper()
+    helper = _helper(ctx)
     stuck_help = helper.get_stuck_help(problem_context, what_tried or "")
     
     if stuck_help:
@@ -755,6 +1362,58 @@ def stuck(problem: str, what_tried: Optional[str]):
         click.echo(stuck_help)
 
 
+@cli.command()
+@click.argument('problem_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--action', '-a', default='solve',
+              type=click.Choice(['solve', 'hint', 'pseudocode']),
+              help='What to ask for each problem')
+@click.option('--language', '-l', default='python',
+              type=click.Choice(['python', 'typescript']),
+              help='Programming language (solve only)')
+@click.option('--concurrency', '-c', default=5, type=click.IntRange(1, MAX_CONCURRENCY),
+              help='Requests in flight to start with; adjusted to observed latency')
+@click.option('--max-concurrency', default=MAX_CONCURRENCY, type=click.IntRange(1, MAX_CONCURRENCY),
+              help='Upper bound on requests in flight')
+@click.option('--save', is_flag=True, help='Save each solution to its solution file (solve only)')
+@click.pass_context
+def batch(ctx: click.Context, problem_file: str, action: str, language: str, concurrency: int,
+          max_concurrency: int, save: bool):
+    """Run one request per problem ID listed in PROBLEM_FILE, concurrently"""
+    
+    problem_ids = [line.strip() for line in Path(problem_file).read_text().splitlines()
+                   if line.strip() and not line.startswith('#')]
+    
+    problems = {}
+    for problem_id in problem_ids:
+        problem_context = load_problem(problem_id)
+        if problem_context:
+            problems[problem_id] = problem_context
+    
+    if not problems:
+        return
+    
+    helper = _helper(ctx)
+    requests_by_action = {
+        'solve': lambda p: functools.partial(helper.get_solution, p, language),
+        'hint': lambda p: functools.partial(helper.get_hint, p),
+        'pseudocode': lambda p: functools.partial(helper.get_pseudocode, p),
+    }
+    calls = [requests_by_action[action](p) for p in problems.values()]
+    
+    click.echo(f"🤖 Running {action} for {len(calls)} problems (starting {concurrency} at a time)...")
+    import asyncio
+    results = asyncio.run(helper.abatch(calls, concurrency, max_concurrency))
+    
+    for (problem_id, problem_context), result in zip(problems.items(), results):
+        click.echo("\n" + "="*60)
+        click.echo(f"📌 {problem_context.title}")
+        click.echo("="*60)
+        click.echo(result or "❌ No response")
+        
+        if save and action == 'solve' and result:
+            save_solution(problem_id, language, result)
+
+
 @cli.command()
 @click.option('--difficulty', '-d', default='medium',
               type=click.Choice(['easy', 'medium', 'hard']),
@@ -763,8 +1422,11 @@ def stuck(problem: str, what_tried: Optional[str]):
 @click.option('--similar-to', '-s', help='Generate problem similar to this existing problem')
 @click.option('--style', default='leetcode', help='Problem style (leetcode, competitive, etc.)')
 @click.option('--save/--no-save', default=True, help='Save the generated problem to repository')
-def generate(difficulty: str, topics: Optional[str], similar_to: Optional[str], 
-            style: str, save: bool):
+@click.option('--cache/--no-cache', default=False,
+              help='Reuse the problem generated earlier for the same options instead of a fresh one')
+@click.pass_context
+def generate(ctx: click.Context, difficulty: str, topics: Optional[str], similar_to: Optional[str], 
+            style: str, save: bool, cache: bool):
     """Generate a new practice problem using Claude"""
     
     topic_list = [topic.strip() for topic in topics.split(',')] if topics else None
@@ -775,7 +1437,7 @@ def generate(difficulty: str, topics: Optional[str], similar_to: Optional[str],
     if similar_to:
         click.echo(f"   Similar to: {similar_to}")
     
-    helper = ClaudeHelper()
+    helper = _helper(ctx, use_cache=cache)
     problem_data = helper.generate_problem(
         difficulty=difficulty,
         topics=topic_list,
@@ -851,8 +1513,7 @@ def save_generated_problem(problem_data: Dict[str, Any]):
         problem_file = manager.problems_dir / difficulty / f"{problem_id}.json"
         problem_file.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(problem_file, 'w') as f:
-            json.dump(complete_problem, f, indent=2)
+        write_atomic(problem_file, orjson.dumps(complete_problem, option=orjson.OPT_INDENT_2))
         
         # Create solution templates using a simple object with the required attributes
         class TempProblem:
@@ -885,8 +1546,7 @@ def save_solution(problem_id: str, language: str, solution: str):
     solution_file = solution_dir / f"{problem_id}.{extension}"
     
     try:
-        with open(solution_file, 'w') as f:
-            f.write(solution)
+        write_atomic(solution_file, solution.encode('utf-8'))
         click.echo(f"✅ Solution saved to: {solution_file}")
     except Exception as e:
         click.echo(f"❌ Error saving solution: {e}", err=True)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Claude Worker - Long-running Claude Helper process for scripts and editors
+Reads one JSON command per line on stdin and writes one JSON result per line
+on stdout, so repeated requests skip interpreter startup and module imports.
+
+Example:
+    $ python tools/claude_worker.py
+    {"cmd": "hint", "problem": "two-sum", "level": "subtle"}
+    {"ok": true, "output": "..."}
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.claude_helper import ClaudeHelper, ProblemContext, load_problem
+
+
+def _read_solution(problem: str, language: str, file: Optional[str] = None) -> str:
+    """Read the user's solution code for a problem"""
+    if file:
+        solution_file = Path(file)
+    else:
+        extension = 'py' if language == 'python' else 'ts'
+        solution_file = Path(f"solutions/{language}/{problem}.{extension}")
+
+    if not solution_file.exists():
+        raise ValueError(f"Solution file not found: {solution_file}")
+
+    return solution_file.read_text()
+
+
+def _require_problem(request: Dict[str, Any]) -> ProblemContext:
+    """Load the problem named in a request"""
+    problem = load_problem(request.get('problem', ''))
+    if not problem:
+        raise ValueError(f"Problem '{request.get('problem')}' not found")
+    return problem
+
+
+def _solve(helper: ClaudeHelper, request: Dict[str, Any]) -> str:
+    return helper.get_solution(_require_problem(request),
+                               request.get('language', 'python'),
+                               request.get('approach', 'optimal'))
+
+
+def _hint(helper: ClaudeHelper, request: Dict[str, Any]) -> str:
+    return helper.get_hint(_require_problem(request), request.get('level', 'subtle'))
+
+
+def _review(helper: ClaudeHelper, request: Dict[str, Any]) -> str:
+    language = request.get('language', 'python')
+    code = _read_solution(request.get('problem', ''), language, request.get('file'))
+    return helper.review_solution(_require_problem(request), code, language)
+
+
+def _explain(helper: ClaudeHelper, request: Dict[str, Any]) -> str:
+    return helper.explain_concept(request['topic'], request.get('context', ''))
+
+
+def _debug(helper: ClaudeHelper, request: Dict[str, Any]) -> str:
+    language = request.get('language', 'python')
+    code = _read_solution(request.get('problem', ''), language)
+    return helper.debug_solution(_require_problem(request), code, language,
+                                 request.get('error', ''))
+
+
+def _pseudocode(helper: ClaudeHelper, request: Dict[str, Any]) -> str:
+    return helper.get_pseudocode(_require_problem(request),
+                                 request.get('approach', 'high-level'))
+
+
+def _walkthrough(helper: ClaudeHelper, request: Dict[str, Any]) -> str:
+    return helper.walkthrough_test_case(_require_problem(request),
+                                        request.get('test_case', ''))
+
+
+def _stuck(helper: ClaudeHelper, request: Dict[str, Any]) -> str:
+    return helper.get_stuck_help(_require_problem(request), request.get('what_tried', ''))
+
+
+COMMANDS: Dict[str, Callable[[ClaudeHelper, Dict[str, Any]], str]] = {
+    'solve': _solve,
+    'hint': _hint,
+    'review': _review,
+    'explain': _explain,
+    'debug': _debug,
+    'pseudocode': _pseudocode,
+    'walkthrough': _walkthrough,
+    'stuck': _stuck,
+}
+
+
+def serve(stdin=sys.stdin, stdout=sys.stdout) -> None:
+    """Answer JSON commands from stdin until EOF"""
+    helper = ClaudeHelper()
+    stats = {'started_at': time.time(), 'requests': 0, 'errors': 0}
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        # One bad request gets an error reply; it never stops the worker
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            cmd = request.get('cmd')
+
+            if cmd == 'stats':
+                response = {'ok': True, 'stats': {**stats, 'uptime': time.time() - stats['started_at']}}
+            elif cmd in COMMANDS:
+                stats['requests'] += 1
+                output = COMMANDS[cmd](helper, request)
+                if not output:
+                    # The helper reports failed API calls as an empty response
+                    raise ValueError(f"No response for '{cmd}'")
+                response = {'ok': True, 'output': output}
+            else:
+                raise ValueError(f"Unknown command: {cmd}")
+
+        except Exception as e:
+            stats['errors'] += 1
+            response = {'ok': False, 'error': str(e)}
+
+        stdout.write(json.dumps(response) + "\n")
+        stdout.flush()
+
+
+if __name__ == '__main__':
+    serve()
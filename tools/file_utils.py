@@ -0,0 +1,36 @@
+"""
+File Utilities - Helpers shared by the tools for writing files safely
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+# Read once, at import, so atomically written files get the same permissions
+# as ones created with open()
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def write_atomic(path: Path, data: bytes):
+    """Replace a file's contents so readers see either the old or the new file
+
+    The data goes to a temporary file in the same directory with a single
+    write, is flushed to disk, and is then renamed over the target.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.chmod(tmp_name, 0o666 & ~_UMASK)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
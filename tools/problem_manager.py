@@ -5,22 +5,130 @@ Helps add new problems, track progress, and organize practice sessions.
 """
 
 import os
+import functools
 import json
+import re
 import click
+import orjson
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Set, Tuple
+from dataclasses import dataclass
 from datetime import datetime
-import shutil
 import sys
-from dotenv import load_dotenv
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file. The API key is the only one
+# read here (claude_helper loads .env for itself), so there's nothing to do
+# when it's already set
+if os.environ.get('OPENROUTER_API_KEY') is None:
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # Add the project root to Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from tools.file_utils import write_atomic
+
+
+# Problem IDs are titles lowercased, with punctuation dropped and runs of
+# spaces and hyphens turned into one hyphen
+_ID_STRIP = re.compile(r'[^\w\s-]')
+_ID_DASH = re.compile(r'[-\s]+')
+
+# Parsed problem files and solution checks, reused for as long as the file's
+# (mtime, size) is unchanged, so listing and stats in one process read each
+# file once
+_JSON_CACHE: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_SOLVED_CACHE: Dict[Path, Tuple[Tuple[int, int], bool]] = {}
+
+
+def _signature(path: Path) -> Tuple[int, int]:
+    """A file's (mtime, size), which changes whenever it is rewritten"""
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    """Parse a problem file, or return it from the cache if it hasn't changed"""
+    signature = _signature(path)
+    cached = _JSON_CACHE.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    
+    with open(path, 'rb') as f:
+        data = orjson.loads(f.read())
+    _JSON_CACHE[path] = (signature, data)
+    return data
+
+
+# Placeholders in the solution templates, all filled in one pass
+_PLACEHOLDER = re.compile(r'\{(problem_title|difficulty|topics|description|examples|constraints)\}')
+
+# Bumped whenever the summaries in problems/_index.json change shape, so an
+# index written by an older version is rebuilt rather than misread
+_INDEX_VERSION = 2
+
+# Below this many files, starting threads costs more than reading in parallel saves
+_PARALLEL_LOAD_MIN = 16
+
+
+def _load_many(paths: List[Path]) -> List[Optional[Dict[str, Any]]]:
+    """_load_json for several files, with None for any that can't be read
+    
+    Larger batches are read on a thread pool, overlapping the open and read
+    calls, which is where most of the time goes on slow or network disks.
+    """
+    def load(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            return _load_json(path)
+        except (OSError, orjson.JSONDecodeError):
+            return None
+    
+    if len(paths) < _PARALLEL_LOAD_MIN:
+        return [load(path) for path in paths]
+    
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        return list(executor.map(load, paths))
+
+
+def _atomic_write_json(path: Path, obj: Any):
+    """Write obj as indented JSON, so readers see either the old or the new file"""
+    write_atomic(path, orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    _JSON_CACHE.pop(path, None)
+
+
+# How much of a solution file _has_implementation looks at
+_SOLUTION_HEAD_BYTES = 8192
+
+
+@functools.lru_cache(maxsize=None)
+def _load_template(path: Path) -> Optional[str]:
+    """A solution template's text, read once per process; None if there isn't one"""
+    try:
+        return path.read_text()
+    except FileNotFoundError:
+        return None
+
+
+def _has_implementation(path: Path) -> bool:
+    """Whether a solution file holds more than the template, cached like _load_json"""
+    signature = _signature(path)
+    cached = _SOLVED_CACHE.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    
+    # Check if it's more than just the template
+    # (simple heuristic: look for actual implementation). The templates'
+    # stubs are within their first couple of KB, so only the start of the
+    # file is read; further down, 'pass' and 'null' are more likely to be in
+    # real code ("All tests passed!") than left over from the template
+    with open(path, 'rb') as f:
+        head = f.read(_SOLUTION_HEAD_BYTES)
+    implemented = head.find(b'pass') == -1 and head.find(b'null') == -1
+    _SOLVED_CACHE[path] = (signature, implemented)
+    return implemented
+
 
 @dataclass
 class Problem:
@@ -68,9 +176,19 @@ class ProblemManager:
         self.templates_dir = Path("templates")
         self.progress_dir = Path("progress")
         
+        # Directories this manager has already created, so writing many
+        # problems doesn't repeat the mkdir calls (see _ensure_dir)
+        self._ensured_dirs: Set[Path] = set()
+        
         # Ensure directories exist
         for directory in [self.problems_dir, self.solutions_dir, self.progress_dir]:
-            directory.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(directory)
+        
+        # Summaries of every problem file, kept between runs (see _load_index)
+        self.index_file = self.problems_dir / "_index.json"
+        
+        # Solution files on disk, listed on first use (see _list_solutions)
+        self._solution_files: Optional[Set[Path]] = None
     
     def add_problem(self, title: str, difficulty: str, topics: List[str], 
                    description: str = "", leetcode_url: str = "") -> Problem:
@@ -93,10 +211,10 @@ class ProblemManager:
         
         # Save problem file
         problem_file = self.problems_dir / difficulty.lower() / f"{problem_id}.json"
-        problem_file.parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(problem_file.parent)
         
-        with open(problem_file, 'w') as f:
-            json.dump(asdict(problem), f, indent=2)
+        # orjson serializes dataclasses directly, without asdict()'s deep copy
+        _atomic_write_json(problem_file, problem)
         
         # Create solution template files
         self._create_solution_templates(problem_id, problem)
@@ -111,48 +229,38 @@ class ProblemManager:
                      topic: Optional[str] = None, solved: Optional[bool] = None) -> List[Dict]:
         """List problems with optional filtering"""
         
-        problems = []
-        
-        # Search all difficulty directories
-        search_dirs = [difficulty.lower()] if difficulty else ['easy', 'medium', 'hard']
+        problem_files = []
+        topic = topic.lower() if topic else None
         
-        for diff in search_dirs:
-            diff_dir = self.problems_dir / diff
-            if not diff_dir.exists():
+        # Filter on the index, so only matching problem files are parsed
+        for relative_path, summary in self._load_index().items():
+            if difficulty and not relative_path.startswith(f"{difficulty.lower()}/"):
                 continue
-                
-            for problem_file in diff_dir.glob("*.json"):
-                try:
-                    with open(problem_file, 'r') as f:
-                        problem_data = json.load(f)
-                    
-                    # Apply filters
-                    if topic and topic.lower() not in [t.lower() for t in problem_data.get('topics', [])]:
-                        continue
-                    
-                    if solved is not None:
-                        is_solved = self._is_problem_solved(problem_data['id'])
-                        if solved != is_solved:
-                            continue
-                    
-                    problems.append(problem_data)
-                    
-                except (json.JSONDecodeError, KeyError):
+            
+            if topic and topic not in summary['topics_lower']:
+                continue
+            
+            if solved is not None:
+                is_solved = self._is_problem_solved(summary['id'])
+                if solved != is_solved:
                     continue
+            
+            problem_files.append(self.problems_dir / relative_path)
         
+        problems = [problem for problem in _load_many(problem_files) if problem is not None]
         return sorted(problems, key=lambda x: (x['difficulty'], x['title']))
     
     def get_problem(self, problem_id: str) -> Optional[Dict]:
         """Get a specific problem by ID"""
         
-        # Search in all difficulty directories
-        for difficulty in ['easy', 'medium', 'hard']:
-            problem_file = self.problems_dir / difficulty / f"{problem_id}.json"
-            if problem_file.exists():
+        # Problems are found by file name, as claude_helper's load_problem
+        # finds them. The index lists easy problems first, so an ID found in
+        # several difficulty directories resolves to the easiest one.
+        for relative_path in self._load_index():
+            if Path(relative_path).stem == problem_id:
                 try:
-                    with open(problem_file, 'r') as f:
-                        return json.load(f)
-                except json.JSONDecodeError:
+                    return _load_json(self.problems_dir / relative_path)
+                except (OSError, orjson.JSONDecodeError):
                     continue
         
         return None
@@ -173,8 +281,9 @@ class ProblemManager:
         
         # Save back to file
         problem_file = self.problems_dir / problem_data['difficulty'] / f"{problem_id}.json"
-        with open(problem_file, 'w') as f:
-            json.dump(problem_data, f, indent=2)
+        # Also drops problem_data, the cached copy changed above, rather than
+        # trust a timestamp that may not have moved
+        _atomic_write_json(problem_file, problem_data)
         
         return True
     
@@ -188,6 +297,7 @@ class ProblemManager:
         # Delete problem file
         problem_file = self.problems_dir / problem_data['difficulty'] / f"{problem_id}.json"
         problem_file.unlink()
+        _JSON_CACHE.pop(problem_file, None)
         
         # Delete solution files
         for lang in ['python', 'react-ts']:
@@ -195,6 +305,8 @@ class ProblemManager:
             solution_file = self.solutions_dir / lang / f"{problem_id}.{extension}"
             if solution_file.exists():
                 solution_file.unlink()
+            _SOLVED_CACHE.pop(solution_file, None)
+        self._solution_files = None
         
         click.echo(f"✅ Problem '{problem_id}' deleted successfully!")
         return True
@@ -202,100 +314,147 @@ class ProblemManager:
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about problems and progress"""
         
+        by_difficulty: Counter = Counter()
+        solved_by_difficulty: Counter = Counter()
+        # topic -> [total, solved]
+        by_topic: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        
+        # The index has everything counted here; no problem file is parsed
+        for problem in self._load_index().values():
+            difficulty = problem['difficulty']
+            is_solved = self._is_problem_solved(problem['id'])
+            
+            by_difficulty[difficulty] += 1
+            solved_by_difficulty[difficulty] += is_solved
+            for topic in problem['topics']:
+                counts = by_topic[topic]
+                counts[0] += 1
+                counts[1] += is_solved
+        
+        total = sum(by_difficulty.values())
+        solved = sum(solved_by_difficulty.values())
+        levels = {"easy": 0, "medium": 0, "hard": 0}
+        
         stats = {
-            "total_problems": 0,
-            "by_difficulty": {"easy": 0, "medium": 0, "hard": 0},
-            "by_topic": {},
-            "solved": {"total": 0, "easy": 0, "medium": 0, "hard": 0},
-            "unsolved": {"total": 0, "easy": 0, "medium": 0, "hard": 0},
-            "solve_rate": 0.0
+            "total_problems": total,
+            "by_difficulty": {**levels, **by_difficulty},
+            "by_topic": {topic: {"total": topic_total, "solved": topic_solved}
+                         for topic, (topic_total, topic_solved) in by_topic.items()},
+            "solved": {"total": solved, **levels, **solved_by_difficulty},
+            "unsolved": {"total": total - solved, **levels, **(by_difficulty - solved_by_difficulty)},
+            "solve_rate": solved / total * 100 if total else 0.0
         }
         
-        all_problems = self.list_problems()
-        stats["total_problems"] = len(all_problems)
+        return stats
+    
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Summaries of every problem, keyed by path relative to problems/
         
-        for problem in all_problems:
-            difficulty = problem['difficulty']
-            stats["by_difficulty"][difficulty] += 1
+        Summaries are read from the index file and reused while the problem
+        file's (mtime, size) matches the one recorded with it, so only new or
+        changed files are parsed. Entries are in easy, medium, hard order.
+        """
+        try:
+            stored_index = orjson.loads(self.index_file.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            stored_index = {}
+        
+        stored = {}
+        if isinstance(stored_index, dict) and stored_index.get('version') == _INDEX_VERSION:
+            stored = stored_index['problems']
+        
+        # (path relative to problems/, [mtime, size]) for every problem file
+        signatures = []
+        for difficulty in ['easy', 'medium', 'hard']:
+            try:
+                with os.scandir(self.problems_dir / difficulty) as entries:
+                    problem_files = [(entry.name, entry.stat()) for entry in entries
+                                     if entry.name.endswith('.json')
+                                     and not entry.name.startswith('.') and entry.is_file()]
+            except FileNotFoundError:
+                continue
             
-            # Count topics
-            for topic in problem.get('topics', []):
-                if topic not in stats["by_topic"]:
-                    stats["by_topic"][topic] = {"total": 0, "solved": 0}
-                stats["by_topic"][topic]["total"] += 1
+            signatures.extend((f"{difficulty}/{name}", [st.st_mtime_ns, st.st_size])
+                              for name, st in sorted(problem_files))
+        
+        # New and changed files are parsed together, so they can be read in parallel
+        changed = [relative_path for relative_path, signature in signatures
+                   if stored.get(relative_path, {}).get('signature') != signature]
+        parsed = dict(zip(changed, _load_many([self.problems_dir / path for path in changed])))
+        
+        index = {}
+        for relative_path, signature in signatures:
+            if relative_path not in parsed:
+                index[relative_path] = stored[relative_path]
+                continue
             
-            # Check if solved
-            if self._is_problem_solved(problem['id']):
-                stats["solved"]["total"] += 1
-                stats["solved"][difficulty] += 1
-                
-                # Update topic solved count
-                for topic in problem.get('topics', []):
-                    stats["by_topic"][topic]["solved"] += 1
-            else:
-                stats["unsolved"]["total"] += 1
-                stats["unsolved"][difficulty] += 1
-        
-        # Calculate solve rate
-        if stats["total_problems"] > 0:
-            stats["solve_rate"] = stats["solved"]["total"] / stats["total_problems"] * 100
+            problem_data = parsed[relative_path]
+            try:
+                index[relative_path] = {
+                    'signature': signature,
+                    'id': problem_data['id'],
+                    'title': problem_data['title'],
+                    'difficulty': problem_data['difficulty'],
+                    'topics': problem_data.get('topics', []),
+                    # Lowercased once here, for list_problems' topic filter
+                    'topics_lower': [t.lower() for t in problem_data.get('topics', [])],
+                }
+            except (KeyError, TypeError, AttributeError):
+                # Unreadable, or not a problem
+                continue
         
-        return stats
+        if index != stored:
+            self._write_index({'version': _INDEX_VERSION, 'problems': index})
+        return index
+    
+    def _write_index(self, index: Dict[str, Any]):
+        """Save the index, if the problems directory is writable"""
+        try:
+            _atomic_write_json(self.index_file, index)
+        except OSError as e:
+            # Only a cache; the next run rebuilds it
+            click.echo(f"⚠️  Could not save the problem index {self.index_file}: {e}", err=True)
+    
+    def _ensure_dir(self, directory: Path):
+        """Create a directory, unless this manager already has"""
+        if directory not in self._ensured_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(directory)
     
     def _generate_id(self, title: str) -> str:
         """Generate a URL-friendly ID from problem title"""
-        import re
-        
-        # Convert to lowercase and replace spaces/special chars with hyphens
-        problem_id = re.sub(r'[^\w\s-]', '', title.lower())
-        problem_id = re.sub(r'[-\s]+', '-', problem_id)
-        problem_id = problem_id.strip('-')
-        
-        return problem_id
+        return _ID_DASH.sub('-', _ID_STRIP.sub('', title.lower())).strip('-')
     
     def _create_solution_templates(self, problem_id: str, problem: Problem):
         """Create solution template files for a new problem"""
         
         # Template replacements
         replacements = {
-            '{problem_title}': problem.title,
-            '{difficulty}': problem.difficulty.title(),
-            '{topics}': ', '.join(problem.topics),
-            '{description}': problem.description or 'TODO: Add description',
-            '{examples}': 'TODO: Add examples',
-            '{constraints}': 'TODO: Add constraints'
+            'problem_title': problem.title,
+            'difficulty': problem.difficulty.title(),
+            'topics': ', '.join(problem.topics),
+            'description': problem.description or 'TODO: Add description',
+            'examples': 'TODO: Add examples',
+            'constraints': 'TODO: Add constraints'
         }
         
-        # Create Python solution
-        python_template = self.templates_dir / "python_solution_template.py"
-        if python_template.exists():
-            with open(python_template, 'r') as f:
-                content = f.read()
-            
-            for placeholder, value in replacements.items():
-                content = content.replace(placeholder, value)
-            
-            python_solution = self.solutions_dir / "python" / f"{problem_id}.py"
-            python_solution.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(python_solution, 'w') as f:
-                f.write(content)
-        
-        # Create TypeScript solution
-        ts_template = self.templates_dir / "react_ts_solution_template.ts"
-        if ts_template.exists():
-            with open(ts_template, 'r') as f:
-                content = f.read()
-            
-            for placeholder, value in replacements.items():
-                content = content.replace(placeholder, value)
+        # Create Python and TypeScript solutions
+        solutions = [
+            ("python_solution_template.py", self.solutions_dir / "python" / f"{problem_id}.py"),
+            ("react_ts_solution_template.ts", self.solutions_dir / "react-ts" / f"{problem_id}.ts"),
+        ]
+        for template_name, solution_file in solutions:
+            template = _load_template(self.templates_dir / template_name)
+            if template is None:
+                continue
             
-            ts_solution = self.solutions_dir / "react-ts" / f"{problem_id}.ts"
-            ts_solution.parent.mkdir(parents=True, exist_ok=True)
+            content = _PLACEHOLDER.sub(lambda match: replacements[match.group(1)], template)
             
-            with open(ts_solution, 'w') as f:
+            self._ensure_dir(solution_file.parent)
+            with open(solution_file, 'w') as f:
                 f.write(content)
         
+        self._solution_files = None
         click.echo(f"   📝 Created solution templates for {problem_id}")
     
     def _is_problem_solved(self, problem_id: str) -> bool:
@@ -306,20 +465,37 @@ class ProblemManager:
         ts_solution = self.solutions_dir / "react-ts" / f"{problem_id}.ts"
         
         # Consider solved if either solution exists and has non-template content
+        solution_files = self._list_solutions()
         for solution_file in [python_solution, ts_solution]:
-            if solution_file.exists():
-                try:
-                    with open(solution_file, 'r') as f:
-                        content = f.read()
-                    
-                    # Check if it's more than just the template
-                    # (simple heuristic: look for actual implementation)
-                    if 'pass' not in content and 'null' not in content:
-                        return True
-                except:
-                    continue
+            if solution_file not in solution_files:
+                continue
+            try:
+                if _has_implementation(solution_file):
+                    return True
+            except (OSError, ValueError):
+                # Removed since the listing, or unreadable
+                continue
         
         return False
+    
+    def _list_solutions(self) -> Set[Path]:
+        """Every Python and TypeScript solution file, from one scan per directory
+        
+        Checking the set replaces a stat per solution file when listing or
+        counting many problems.
+        """
+        if self._solution_files is None:
+            solution_files = set()
+            for lang in ['python', 'react-ts']:
+                lang_dir = self.solutions_dir / lang
+                try:
+                    with os.scandir(lang_dir) as entries:
+                        solution_files.update(lang_dir / entry.name for entry in entries
+                                              if entry.is_file())
+                except FileNotFoundError:
+                    continue
+            self._solution_files = solution_files
+        return self._solution_files
 
 
 @click.group()
@@ -491,7 +667,9 @@ def stats():
 @click.option('--topics', '-t', help='Comma-separated list of topics to focus on')
 @click.option('--similar-to', '-s', help='Generate problem similar to this existing problem')
 @click.option('--style', default='leetcode', help='Problem style')
-def generate(difficulty: str, topics: str, similar_to: str, style: str):
+@click.option('--cache/--no-cache', default=False,
+              help='Reuse the problem generated earlier for the same options instead of a fresh one')
+def generate(difficulty: str, topics: str, similar_to: str, style: str, cache: bool):
     """Generate a new problem using Claude AI"""
     
     # Check if OpenRouter API key is set
@@ -512,7 +690,7 @@ def generate(difficulty: str, topics: str, similar_to: str, style: str):
         if similar_to:
             click.echo(f"   Similar to: {similar_to}")
         
-        helper = ClaudeHelper()
+        helper = ClaudeHelper(use_cache=cache)
         problem_data = helper.generate_problem(
             difficulty=difficulty,
             topics=topic_list,
@@ -573,10 +751,9 @@ def generate(difficulty: str, topics: str, similar_to: str, style: str):
             
             # Save the problem file
             problem_file = manager.problems_dir / difficulty.lower() / f"{problem_id}.json"
-            problem_file.parent.mkdir(parents=True, exist_ok=True)
+            manager._ensure_dir(problem_file.parent)
             
-            with open(problem_file, 'w') as f:
-                json.dump(complete_problem, f, indent=2)
+            _atomic_write_json(problem_file, complete_problem)
             
             # Create solution templates
             problem_obj = Problem(
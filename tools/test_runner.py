@@ -5,47 +5,206 @@ Supports both Python and TypeScript/React solutions with automatic test discover
 """
 
 import os
+import functools
+import hashlib
 import json
+import mmap
+import re
+import shutil
+import signal
 import subprocess
 import sys
+import threading
 import click
+import contextlib
+import io
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
-import importlib.util
-import tempfile
+from typing import Callable, Dict, List, NamedTuple, Optional, Any, Tuple, Union
 
 # Add the project root to Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from tools.file_utils import write_atomic
+
+# A test outcome in pytest's output, as "path::test STATUS" in verbose
+# listings or "STATUS path::test" in -rA summaries and xdist progress
+_PYTEST_OUTCOME = re.compile(
+    r'(?P<status_before>PASSED|FAILED|ERROR) +(?P<test_after>[^\s:]+::\S+)(?: - .*)?'
+    r'|(?P<test_before>[^\s:]+::\S+) +(?P<status_after>PASSED|FAILED|ERROR)'
+)
+
+
+def _stream_pytest(cmd: List[str], timeout: float) -> Tuple[Dict[str, Tuple[str, str]], int, str]:
+    """Run a pytest command, parsing its test outcomes as the lines arrive
+    
+    Returns each test ID's status and the text reporting it, the return
+    code, and the output up to the first outcome, which is all there is to
+    report when no tests ran. A test reported more than once (in the
+    listing and the summary) keeps its last report, which carries the
+    failure message. Raises subprocess.TimeoutExpired if pytest runs longer
+    than timeout seconds.
+    """
+    outcomes: Dict[str, Tuple[str, str]] = {}
+    head: List[str] = []
+    
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               text=True, bufsize=1)
+    timed_out = threading.Event()
+    
+    def kill():
+        timed_out.set()
+        process.kill()
+    
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        for line in process.stdout:
+            for match in _PYTEST_OUTCOME.finditer(line):
+                test_id = match['test_after'] or match['test_before']
+                status = (match['status_before'] or match['status_after']).lower()
+                outcomes[test_id] = (status, match[0])
+            if not outcomes:
+                head.append(line)
+        returncode = process.wait()
+    finally:
+        timer.cancel()
+        process.stdout.close()
+    
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return outcomes, returncode, "".join(head)
+
+# Template text that shows a solution hasn't been filled in yet, in the
+# order validate_solution reports it; matched as plain substrings. These
+# and the markers below are ASCII, so files are scanned as bytes.
+_PLACEHOLDERS = ['{problem_title}', '{difficulty}', '{topics}', 'TODO:', 'pass', 'null']
+_PLACEHOLDER_RE = re.compile(b'|'.join(re.escape(p.encode()) for p in _PLACEHOLDERS))
+
+# Markers validate_solution looks for to tell whether a solution has a
+# solve method and test cases
+_SIG_RE = re.compile(rb'def test_|class Test|def |solve\(|testCases')
+
+# Script each of TestRunner's long-running ts-node workers runs
+_TS_RUNNER = Path(__file__).parent / "ts_runner.js"
+
+# validate_solution results for unchanged solution files, kept at the
+# project root wherever the runner is started from. The patterns that
+# produced the results are fingerprinted, so editing them drops the cache.
+_VALIDATION_CACHE = Path(__file__).resolve().parent.parent / ".leetcode_validate_cache.json"
+_VALIDATION_VERSION = hashlib.sha256(_PLACEHOLDER_RE.pattern + b"\0" + _SIG_RE.pattern).hexdigest()[:16]
+
+# Batches with at least this many files run on pytest-xdist workers, when
+# it's installed; for fewer, starting the workers costs more than it saves
+_XDIST_MIN_FILES = 8
+
+# Running a solution in-process swaps sys.stdout, which is shared by every
+# thread of run_all_tests
+_redirect_lock = threading.Lock()
+
+# Seconds a solution's tests may run before they count as timed out
+_TEST_TIMEOUT = 30
+
+
+class _TestTimeout(Exception):
+    """Raised into a test that runs past _TEST_TIMEOUT in an in-process pytest run"""
+
+
+def _forget_module(solution_file: Path):
+    """Drop a solution imported by an in-process pytest run, so the next run
+    imports the file afresh rather than testing a stale copy"""
+    target = solution_file.resolve()
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, '__file__', None)
+        if module_file and Path(module_file).resolve() == target:
+            sys.modules.pop(name, None)
+
+
+class _OutcomeCollector:
+    """pytest plugin recording each test's outcome as pytest -v would report it"""
+    
+    def __init__(self):
+        self.outcomes: Dict[str, Tuple[str, str]] = {}
+    
+    def pytest_runtest_logreport(self, report):
+        if report.when == 'call' and not report.skipped:
+            status = report.outcome
+        elif report.failed:
+            # A failing fixture setup or teardown
+            status = 'error'
+        else:
+            return
+        
+        # The same one-line form as pytest's short test summary
+        message = f"{status.upper()} {report.nodeid}"
+        crash = getattr(report.longrepr, 'reprcrash', None)
+        if crash is not None:
+            message += f" - {crash.message.splitlines()[0] if crash.message else ''}"
+        self.outcomes[report.nodeid] = (status, message)
+
+
+# Where npx finds locally installed tools: the project's node_modules,
+# looked up from the working directory and from the repository root
+_NODE_BIN_DIRS = [Path("node_modules") / ".bin", Path(__file__).parent.parent / "node_modules" / ".bin"]
+
+
+@functools.lru_cache(maxsize=None)
+def _has_node_tool(tool: str) -> bool:
+    """Check if a Node tool is installed locally or on PATH, without starting npx"""
+    search_path = os.pathsep.join([*map(str, _NODE_BIN_DIRS), os.environ.get('PATH', '')])
+    return shutil.which(tool, path=search_path) is not None
+
+
+def _has_jest() -> bool:
+    """Check if Jest is available"""
+    return _has_node_tool('jest')
+
+
+def _has_ts_node() -> bool:
+    """Check if ts-node is available"""
+    return _has_node_tool('ts-node')
+
+
+class TestDetail(NamedTuple):
+    """The outcome of a single test"""
+    name: str
+    status: str
+    message: str
+    time: float
+
 
 class TestResult:
     """Represents the result of running tests"""
     
+    __slots__ = ('_counts', 'details', 'execution_time')
+    
+    # Slot in _counts for each status; anything else is only in the total
+    _STATUS_INDEX = {'passed': 0, 'failed': 1, 'error': 2}
+    
     def __init__(self):
-        self.passed = 0
-        self.failed = 0
-        self.errors = 0
-        self.total = 0
-        self.details = []
+        self._counts = [0, 0, 0, 0]
+        self.details: List[TestDetail] = []
         self.execution_time = 0.0
     
     def add_result(self, name: str, status: str, message: str = "", time: float = 0.0):
         """Add a test result"""
-        self.details.append({
-            'name': name,
-            'status': status,
-            'message': message,
-            'time': time
-        })
-        
-        if status == 'passed':
-            self.passed += 1
-        elif status == 'failed':
-            self.failed += 1
-        elif status == 'error':
-            self.errors += 1
-        
-        self.total += 1
+        self.details.append(TestDetail(name, status, message, time))
+        self._counts[self._STATUS_INDEX.get(status, 3)] += 1
+    
+    @property
+    def passed(self) -> int:
+        return self._counts[0]
+    
+    @property
+    def failed(self) -> int:
+        return self._counts[1]
+    
+    @property
+    def errors(self) -> int:
+        return self._counts[2]
+    
+    @property
+    def total(self) -> int:
+        return len(self.details)
     
     @property
     def success_rate(self) -> float:
@@ -55,26 +214,50 @@ class TestResult:
 class TestRunner:
     """Runs tests for LeetCode solutions"""
     
-    def __init__(self):
+    def __init__(self, jobs: Optional[int] = None):
         self.solutions_dir = Path("solutions")
         self.problems_dir = Path("problems")
+        # Most test runs (and pytest-xdist workers) run_all_tests has going at once
+        self.jobs = jobs or os.cpu_count() or 1
+        self._validation_cache: Optional[Dict[str, Any]] = None
+        
+        # Up to jobs ts-node processes run the TypeScript files, each started
+        # on first need and kept for the next file once it's idle
+        self._ts_idle: List[subprocess.Popen] = []
+        self._ts_started = 0
+        self._ts_available = threading.Condition()
+    
+    def __del__(self):
+        self._stop_ts_workers()
     
-    def run_python_tests(self, problem_id: str) -> TestResult:
-        """Run Python tests for a specific problem"""
+    def run_python_tests(self, problem_id: str, solution_file: Optional[Path] = None,
+                         in_process: bool = False) -> TestResult:
+        """Run Python tests for a specific problem
         
-        solution_file = self.solutions_dir / "python" / f"{problem_id}.py"
+        Callers that have already found the solution file can pass it in.
+        in_process runs pytest in this process, skipping interpreter startup;
+        it's for a single run from the main thread, never the thread pools.
+        """
+        
+        if solution_file is None:
+            solution_file = self.solutions_dir / "python" / f"{problem_id}.py"
         
         if not solution_file.exists():
             result = TestResult()
             result.add_result(problem_id, 'error', f"Solution file not found: {solution_file}")
             return result
         
+        if in_process:
+            result = self._run_pytest_in_process(solution_file)
+            if result is not None:
+                return result
+        
         # Try to run pytest first
         try:
             cmd = [sys.executable, "-m", "pytest", str(solution_file), "-v", "--tb=short"]
-            process = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            outcomes, returncode, output = _stream_pytest(cmd, _TEST_TIMEOUT)
             
-            result = self._parse_pytest_output(process.stdout, process.stderr, process.returncode)
+            result = self._parse_pytest_output(outcomes, output, returncode)
             
         except subprocess.TimeoutExpired:
             result = TestResult()
@@ -86,10 +269,71 @@ class TestRunner:
         
         return result
     
-    def run_typescript_tests(self, problem_id: str) -> TestResult:
-        """Run TypeScript tests for a specific problem"""
+    def run_python_tests_batch(self, solution_files: List[Path]) -> Dict[str, TestResult]:
+        """Run the tests in several Python solution files in one pytest process
+        
+        Python and pytest start up once for the whole batch rather than once
+        per file. Problems whose results can't be told apart in the combined
+        output (no tests found, a file that fails to collect) are re-run on
+        their own with run_python_tests. Results are keyed by problem ID.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        import importlib.util
+        
+        solution_files = {solution_file.stem: solution_file for solution_file in solution_files}
+        found = list(solution_files)
+        
+        # Test outcomes by problem, then by test ID
+        outcomes: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        
+        if found:
+            cmd = [sys.executable, "-m", "pytest", *(str(solution_files[problem_id]) for problem_id in found),
+                   "-v", "--tb=short", "-rA"]
+            if self.jobs > 1 and len(found) >= _XDIST_MIN_FILES and importlib.util.find_spec("xdist"):
+                cmd += ["-n", str(self.jobs)]
+            
+            try:
+                batch_outcomes, returncode, _ = _stream_pytest(cmd, _TEST_TIMEOUT * len(found))
+                # 0: all passed, 1: some failed; anything else (interrupted by
+                # collection errors, usage errors) means per-file runs
+                if returncode in (0, 1):
+                    for test_id, outcome in batch_outcomes.items():
+                        problem_id = Path(test_id.split('::', 1)[0]).stem
+                        outcomes.setdefault(problem_id, {})[test_id] = outcome
+            except subprocess.TimeoutExpired:
+                pass
+        
+        # Files that need a run of their own are re-run side by side, the
+        # same way run_all_tests overlaps the other languages' runs
+        rerun = [problem_id for problem_id in solution_files if problem_id not in outcomes]
+        rerun_results: Dict[str, TestResult] = {}
+        if rerun:
+            with ThreadPoolExecutor(max_workers=min(len(rerun), self.jobs)) as executor:
+                rerun_results = dict(zip(rerun, executor.map(
+                    lambda problem_id: self.run_python_tests(problem_id, solution_files[problem_id]),
+                    rerun)))
+        
+        results = {}
+        for problem_id in solution_files:
+            if problem_id in rerun_results:
+                results[problem_id] = rerun_results[problem_id]
+                continue
+            
+            result = TestResult()
+            for test_id, (status, message) in outcomes[problem_id].items():
+                result.add_result(test_id, status, "" if status == 'passed' else message)
+            results[problem_id] = result
+        
+        return results
+    
+    def run_typescript_tests(self, problem_id: str, solution_file: Optional[Path] = None) -> TestResult:
+        """Run TypeScript tests for a specific problem
+        
+        Callers that have already found the solution file can pass it in.
+        """
         
-        solution_file = self.solutions_dir / "react-ts" / f"{problem_id}.ts"
+        if solution_file is None:
+            solution_file = self.solutions_dir / "react-ts" / f"{problem_id}.ts"
         
         if not solution_file.exists():
             result = TestResult()
@@ -98,7 +342,7 @@ class TestRunner:
         
         try:
             # Try to run with jest/node
-            if self._has_jest():
+            if _has_jest():
                 result = self._run_jest_tests(solution_file)
             else:
                 result = self._run_typescript_file_directly(solution_file)
@@ -111,105 +355,223 @@ class TestRunner:
     
     def run_all_tests(self, language: Optional[str] = None) -> Dict[str, TestResult]:
         """Run tests for all solutions"""
+        from concurrent.futures import ThreadPoolExecutor
         
-        results = {}
-        
+        solutions = self._discover_solutions()
         languages = [language] if language else ['python', 'typescript']
         
-        for lang in languages:
-            if lang == 'python':
-                solution_dir = self.solutions_dir / "python"
-                if solution_dir.exists():
-                    for solution_file in solution_dir.glob("*.py"):
-                        problem_id = solution_file.stem
-                        results[f"{problem_id} (Python)"] = self.run_python_tests(problem_id)
-            
-            elif lang in ['typescript', 'react-ts']:
-                solution_dir = self.solutions_dir / "react-ts"
-                if solution_dir.exists():
-                    for solution_file in solution_dir.glob("*.ts"):
-                        problem_id = solution_file.stem
-                        results[f"{problem_id} (TypeScript)"] = self.run_typescript_tests(problem_id)
+        # Python solutions are tested in one batch; the others one by one
+        python_files = solutions['python'] if 'python' in languages else []
+        typescript_files = (solutions['typescript']
+                            if 'typescript' in languages or 'react-ts' in languages else [])
+        work: List[Tuple[str, Callable[[str, Path], TestResult], Path]] = [
+            (f"{solution_file.stem} (TypeScript)", self.run_typescript_tests, solution_file)
+            for solution_file in typescript_files
+        ]
+        
+        if not python_files and not work:
+            return {}
         
+        # Each test run is a subprocess, so threads are enough to overlap
+        # them; results keep the order the solutions were found in
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(len(work) + 1, self.jobs)) as executor:
+            python_batch = executor.submit(self.run_python_tests_batch, python_files)
+            outcomes = executor.map(lambda item: item[1](item[2].stem, item[2]), work)
+            
+            for problem_id, result in python_batch.result().items():
+                results[f"{problem_id} (Python)"] = result
+            for (name, _, _), result in zip(work, outcomes):
+                results[name] = result
         return results
     
+    def _discover_solutions(self) -> Dict[str, List[Path]]:
+        """Every solution file by language, from one scan of each language directory"""
+        solutions: Dict[str, List[Path]] = {'python': [], 'typescript': []}
+        
+        for lang, directory, extension in [('python', 'python', '.py'),
+                                           ('typescript', 'react-ts', '.ts')]:
+            solution_dir = self.solutions_dir / directory
+            try:
+                with os.scandir(solution_dir) as entries:
+                    names = sorted(entry.name for entry in entries
+                                   if entry.name.endswith(extension) and entry.is_file())
+            except FileNotFoundError:
+                continue
+            
+            # Underscore-prefixed files are helpers, not problems
+            solutions[lang] = [solution_dir / name for name in names
+                               if not name.startswith(('_', '.'))]
+        
+        return solutions
+    
     def validate_solution(self, problem_id: str, language: str) -> Tuple[bool, List[str]]:
-        """Validate that a solution is properly implemented"""
+        """Validate that a solution is properly implemented
         
-        issues = []
+        Results are cached on disk by the file's modification time and size,
+        so an unchanged solution isn't read and scanned again.
+        """
         
         if language == 'python':
             solution_file = self.solutions_dir / "python" / f"{problem_id}.py"
         else:
             solution_file = self.solutions_dir / "react-ts" / f"{problem_id}.ts"
         
-        if not solution_file.exists():
+        try:
+            st = solution_file.stat()
+        except FileNotFoundError:
             return False, [f"Solution file does not exist: {solution_file}"]
         
-        try:
-            with open(solution_file, 'r') as f:
-                content = f.read()
-            
-            # Check for template placeholders
-            placeholders = ['{problem_title}', '{difficulty}', '{topics}', 'TODO:', 'pass', 'null']
-            for placeholder in placeholders:
-                if placeholder in content:
-                    issues.append(f"Template placeholder found: {placeholder}")
-            
-            # Check for basic implementation
-            if language == 'python':
-                if 'def solve(' not in content and 'def ' not in content:
-                    issues.append("No solution method found")
-            else:
-                if 'solve(' not in content:
-                    issues.append("No solve method found")
-            
-            # Check for test cases
-            if language == 'python':
-                if 'def test_' not in content and 'class Test' not in content:
-                    issues.append("No test cases found")
-            else:
-                if 'testCases' not in content:
-                    issues.append("No test cases found")
+        cache = self._load_validation_cache()
+        key = f"{language}:{solution_file.resolve()}"
+        signature = [st.st_mtime_ns, st.st_size]
+        cached = cache.get(key)
+        if cached and cached['signature'] == signature:
+            return len(cached['issues']) == 0, list(cached['issues'])
         
+        try:
+            with open(solution_file, 'rb') as f:
+                if st.st_size:
+                    # Scanned in place, without reading or decoding the file
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                        issues = self._check_solution(content, language)
+                else:
+                    issues = self._check_solution(b"", language)
         except Exception as e:
-            issues.append(f"Error reading solution file: {str(e)}")
+            return False, [f"Error reading solution file: {str(e)}"]
+        
+        cache[key] = {'signature': signature, 'issues': issues}
+        self._write_validation_cache(cache)
         
         return len(issues) == 0, issues
     
-    def _parse_pytest_output(self, stdout: str, stderr: str, returncode: int) -> TestResult:
-        """Parse pytest output to extract test results"""
+    def _check_solution(self, content: Union[bytes, mmap.mmap], language: str) -> List[str]:
+        """List the problems validate_solution reports for a solution's source"""
         
-        result = TestResult()
+        issues = []
         
-        lines = stdout.split('\n') + stderr.split('\n')
+        # Check for template placeholders
+        found = {placeholder.decode() for placeholder in _PLACEHOLDER_RE.findall(content)}
+        for placeholder in _PLACEHOLDERS:
+            if placeholder in found:
+                issues.append(f"Template placeholder found: {placeholder}")
         
-        for line in lines:
-            line = line.strip()
-            
-            # Look for test results
-            if '::' in line and ('PASSED' in line or 'FAILED' in line or 'ERROR' in line):
-                parts = line.split()
-                test_name = parts[0] if parts else "unknown"
-                
-                if 'PASSED' in line:
-                    result.add_result(test_name, 'passed')
-                elif 'FAILED' in line:
-                    result.add_result(test_name, 'failed', line)
-                elif 'ERROR' in line:
-                    result.add_result(test_name, 'error', line)
+        markers = {marker.decode() for marker in _SIG_RE.findall(content)}
+        
+        # Check for basic implementation ('def test_' is matched whole,
+        # so it also counts as a 'def ')
+        if language == 'python':
+            if not markers & {'def ', 'def test_'}:
+                issues.append("No solution method found")
+        else:
+            if 'solve(' not in markers:
+                issues.append("No solve method found")
+        
+        # Check for test cases
+        if language == 'python':
+            if not markers & {'def test_', 'class Test'}:
+                issues.append("No test cases found")
+        else:
+            if 'testCases' not in markers:
+                issues.append("No test cases found")
+        
+        return issues
+    
+    def _load_validation_cache(self) -> Dict[str, Any]:
+        """Validation results by language and solution path, read once per runner"""
+        if self._validation_cache is None:
+            self._validation_cache = {}
+            try:
+                with open(_VALIDATION_CACHE, 'r') as f:
+                    stored = json.load(f)
+                if stored.get('version') == _VALIDATION_VERSION:
+                    self._validation_cache = stored['results']
+            except (OSError, ValueError, AttributeError, KeyError):
+                pass
+        return self._validation_cache
+    
+    def _write_validation_cache(self, cache: Dict[str, Any]):
+        """Replace the validation cache file atomically; failing to write it is harmless"""
+        try:
+            write_atomic(_VALIDATION_CACHE,
+                         json.dumps({'version': _VALIDATION_VERSION, 'results': cache}).encode())
+        except OSError:
+            pass
+    
+    def _parse_pytest_output(self, outcomes: Dict[str, Tuple[str, str]], output: str,
+                             returncode: int) -> TestResult:
+        """Turn the outcomes parsed from pytest's output into test results"""
+        
+        result = TestResult()
+        
+        # Look for test results
+        for test_name, (status, message) in outcomes.items():
+            result.add_result(test_name, status, "" if status == 'passed' else message)
         
         # If no specific tests found, add general result
         if result.total == 0:
             if returncode == 0:
                 result.add_result("pytest", 'passed', "All tests passed")
             else:
-                result.add_result("pytest", 'failed', stderr or stdout)
+                result.add_result("pytest", 'failed', output)
+        
+        return result
+    
+    def _run_pytest_in_process(self, solution_file: Path) -> Optional[TestResult]:
+        """Run a solution's tests with pytest.main in this process
+        
+        Only for the main thread, with nothing else running: pytest swaps
+        sys.stdout, and the timeout is a SIGALRM. Returns None when the
+        tests should run in a pytest subprocess instead: called from another
+        thread, no SIGALRM (Windows), pytest isn't importable, or the file
+        didn't produce any test outcomes (collection errors, no tests).
+        """
+        if threading.current_thread() is not threading.main_thread() or not hasattr(signal, 'SIGALRM'):
+            return None
+        try:
+            import pytest
+        except ImportError:
+            return None
+        
+        collector = _OutcomeCollector()
+        timed_out = False
+        
+        def on_alarm(signum, frame):
+            nonlocal timed_out
+            timed_out = True
+            raise _TestTimeout("Test execution timed out")
+        
+        # After the first alarm, keep interrupting every second so pytest
+        # gives up on the rest of a hung file quickly
+        previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, _TEST_TIMEOUT, 1)
+        try:
+            # Outcomes come from the collector, so pytest's own report is discarded
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                pytest.main([str(solution_file), "--tb=no", "--capture=sys", "-p", "no:cacheprovider"],
+                            plugins=[collector])
+        except Exception:
+            collector.outcomes.clear()
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+            _forget_module(solution_file)
+        
+        result = TestResult()
+        if timed_out:
+            result.add_result(solution_file.stem, 'error', "Test execution timed out")
+            return result
         
+        if not collector.outcomes:
+            return None
+        
+        for test_id, (status, message) in collector.outcomes.items():
+            result.add_result(test_id, status, "" if status == 'passed' else message)
         return result
     
     def _run_python_file_directly(self, solution_file: Path) -> TestResult:
         """Run a Python file directly and capture results"""
+        import importlib.util
         
         result = TestResult()
         
@@ -219,12 +581,9 @@ class TestRunner:
             module = importlib.util.module_from_spec(spec)
             
             # Capture stdout
-            import io
-            import contextlib
-            
             stdout_capture = io.StringIO()
             
-            with contextlib.redirect_stdout(stdout_capture):
+            with _redirect_lock, contextlib.redirect_stdout(stdout_capture):
                 spec.loader.exec_module(module)
             
             output = stdout_capture.getvalue()
@@ -240,11 +599,15 @@ class TestRunner:
         
         result = TestResult()
         
+        if not _has_ts_node():
+            result.add_result(solution_file.stem, 'error', "ts-node not available")
+            return result
+        
+        worker_result = self._run_in_ts_worker(solution_file)
+        if worker_result is not None:
+            return worker_result
+        
         try:
-            # Check if ts-node is available
-            subprocess.run(['npx', 'ts-node', '--version'], 
-                         capture_output=True, check=True, timeout=5)
-            
             # Run the TypeScript file
             cmd = ['npx', 'ts-node', str(solution_file)]
             process = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
@@ -254,8 +617,6 @@ class TestRunner:
             else:
                 result.add_result(solution_file.stem, 'failed', process.stderr)
                 
-        except subprocess.CalledProcessError:
-            result.add_result(solution_file.stem, 'error', "ts-node not available")
         except subprocess.TimeoutExpired:
             result.add_result(solution_file.stem, 'error', "Execution timed out")
         except Exception as e:
@@ -263,6 +624,99 @@ class TestRunner:
         
         return result
     
+    def _run_in_ts_worker(self, solution_file: Path) -> Optional[TestResult]:
+        """Run a TypeScript file in one of the ts-node workers
+        
+        Returns None when the file should be run on its own with npx
+        ts-node: a worker couldn't be started, or it died. A file running
+        past the timeout stops its worker; a fresh one takes its place.
+        """
+        worker = self._checkout_ts_worker()
+        if worker is None:
+            return None
+        
+        result = TestResult()
+        timed_out = threading.Event()
+        
+        def kill():
+            timed_out.set()
+            worker.kill()
+        
+        timer = threading.Timer(_TEST_TIMEOUT, kill)
+        timer.start()
+        try:
+            worker.stdin.write(json.dumps({'file': str(solution_file)}) + "\n")
+            worker.stdin.flush()
+            line = worker.stdout.readline()
+        except OSError:
+            line = ""
+        finally:
+            timer.cancel()
+        
+        if timed_out.is_set():
+            worker.wait()
+            self._checkin_ts_worker(worker, healthy=False)
+            result.add_result(solution_file.stem, 'error', "Execution timed out")
+            return result
+        
+        try:
+            reply = json.loads(line)
+        except ValueError:
+            # The worker exited (ts-node missing, a crash) or its reply was
+            # garbled; either way it can't be trusted with the next file
+            self._close_ts_worker(worker)
+            self._checkin_ts_worker(worker, healthy=False)
+            return None
+        
+        self._checkin_ts_worker(worker, healthy=True)
+        if reply.get('ok'):
+            result.add_result(solution_file.stem, 'passed', reply.get('output', ''))
+        else:
+            result.add_result(solution_file.stem, 'failed', reply.get('error', ''))
+        return result
+    
+    def _checkout_ts_worker(self) -> Optional[subprocess.Popen]:
+        """Take an idle ts-node worker, starting one if fewer than jobs are running"""
+        with self._ts_available:
+            while not self._ts_idle and self._ts_started >= self.jobs:
+                self._ts_available.wait()
+            if self._ts_idle:
+                return self._ts_idle.pop()
+            self._ts_started += 1
+        
+        try:
+            return subprocess.Popen(['node', str(_TS_RUNNER)], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        except OSError:
+            with self._ts_available:
+                self._ts_started -= 1
+                self._ts_available.notify()
+            return None
+    
+    def _checkin_ts_worker(self, worker: subprocess.Popen, healthy: bool):
+        """Return a worker to the pool, or give up its place if it's been stopped"""
+        with self._ts_available:
+            if healthy:
+                self._ts_idle.append(worker)
+            else:
+                self._ts_started -= 1
+            self._ts_available.notify()
+    
+    @staticmethod
+    def _close_ts_worker(worker: subprocess.Popen):
+        """Shut down a ts-node worker"""
+        try:
+            worker.stdin.close()
+            worker.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            worker.kill()
+    
+    def _stop_ts_workers(self):
+        """Shut down the idle ts-node workers"""
+        idle = getattr(self, '_ts_idle', [])
+        while idle:
+            self._close_ts_worker(idle.pop())
+    
     def _run_jest_tests(self, solution_file: Path) -> TestResult:
         """Run tests using Jest"""
         
@@ -282,15 +736,10 @@ class TestRunner:
             result.add_result(solution_file.stem, 'error', str(e))
         
         return result
-    
-    def _has_jest(self) -> bool:
-        """Check if Jest is available"""
-        try:
-            subprocess.run(['npx', 'jest', '--version'], 
-                         capture_output=True, check=True, timeout=5)
-            return True
-        except:
-            return False
+
+
+# Icon for each test status in the verbose listings
+_STATUS_ICON = {"passed": "✅", "failed": "❌", "error": "💥"}
 
 
 @click.group()
@@ -313,7 +762,7 @@ def run(problem_id: str, language: str, verbose: bool):
     
     if language in ['python', 'both']:
         click.echo(f"🐍 Running Python tests for '{problem_id}'...")
-        result = runner.run_python_tests(problem_id)
+        result = runner.run_python_tests(problem_id, in_process=True)
         _display_result(f"{problem_id} (Python)", result, verbose)
     
     if language in ['typescript', 'both']:
@@ -328,10 +777,12 @@ def run(problem_id: str, language: str, verbose: bool):
               default='both',
               help='Language to test')
 @click.option('--verbose', '-v', is_flag=True, help='Verbose output')
-def all(language: str, verbose: bool):
+@click.option('--jobs', '-j', type=click.IntRange(1), default=None,
+              help='Test runs to have going at once (default: CPU count; 1 runs them one at a time)')
+def all(language: str, verbose: bool, jobs: Optional[int]):
     """Run tests for all solutions"""
     
-    runner = TestRunner()
+    runner = TestRunner(jobs)
     
     click.echo(f"🧪 Running all tests...")
     
@@ -357,11 +808,7 @@ def all(language: str, verbose: bool):
         click.echo(f"{status_icon} {name}: {result.passed}/{result.total} passed")
         
         if verbose and result.details:
-            for detail in result.details:
-                status_icon = {"passed": "✅", "failed": "❌", "error": "💥"}[detail['status']]
-                click.echo(f"   {status_icon} {detail['name']}")
-                if detail['message'] and detail['status'] != 'passed':
-                    click.echo(f"      {detail['message']}")
+            click.echo("\n".join(_detail_lines(result)))
     
     click.echo(f"\nOverall: {total_passed}/{total_tests} tests passed")
     if total_failed > 0:
@@ -410,11 +857,17 @@ def _display_result(name: str, result: TestResult, verbose: bool = False):
             click.echo(f"   Errors: {result.errors}")
     
     if verbose and result.details:
-        for detail in result.details:
-            status_icon = {"passed": "✅", "failed": "❌", "error": "💥"}[detail['status']]
-            click.echo(f"   {status_icon} {detail['name']}")
-            if detail['message'] and detail['status'] != 'passed':
-                click.echo(f"      {detail['message']}")
+        click.echo("\n".join(_detail_lines(result)))
+
+
+def _detail_lines(result: TestResult) -> List[str]:
+    """The verbose listing of each test in a result, with messages for those that didn't pass"""
+    lines = []
+    for detail in result.details:
+        lines.append(f"   {_STATUS_ICON[detail.status]} {detail.name}")
+        if detail.message and detail.status != 'passed':
+            lines.append(f"      {detail.message}")
+    return lines
 
 
 if __name__ == '__main__':
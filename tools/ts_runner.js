@@ -0,0 +1,60 @@
+#!/usr/bin/env node
+/**
+ * TS Runner - Long-running ts-node process for tools/test_runner.py
+ * Reads one JSON request per line on stdin and writes one JSON result per
+ * line on stdout, so the TypeScript compiler is loaded once for every
+ * solution tested rather than once per file.
+ *
+ * Example:
+ *   $ node tools/ts_runner.js
+ *   {"file": "solutions/react-ts/two-sum.ts"}
+ *   {"ok": true, "output": "Running 3 test cases..."}
+ */
+
+// Type checked like `npx ts-node <file>`: a type error fails the file
+require('ts-node').register();
+
+const path = require('path');
+const readline = require('readline');
+const util = require('util');
+
+// Solutions log their results; keep a handle on the real stdout for replies
+const reply = process.stdout.write.bind(process.stdout);
+
+function runFile(file) {
+  const lines = [];
+  const capture = (...args) => { lines.push(util.format(...args)); };
+  const saved = { log: console.log, info: console.info, warn: console.warn, error: console.error };
+  Object.assign(console, { log: capture, info: capture, warn: capture, error: capture });
+
+  try {
+    // Load the file afresh, so an edited solution isn't served from the cache
+    const resolved = path.resolve(file);
+    delete require.cache[resolved];
+    const solution = require(resolved);
+
+    // Solutions only run their tests when executed directly
+    if (typeof solution.runTests === 'function') {
+      solution.runTests();
+    }
+    return { ok: true, output: lines.join('\n') };
+  } catch (error) {
+    return { ok: false, output: lines.join('\n'), error: String((error && error.stack) || error) };
+  } finally {
+    Object.assign(console, saved);
+  }
+}
+
+readline.createInterface({ input: process.stdin }).on('line', (line) => {
+  if (!line.trim()) {
+    return;
+  }
+
+  let result;
+  try {
+    result = runFile(JSON.parse(line).file);
+  } catch (error) {
+    result = { ok: false, output: '', error: String(error) };
+  }
+  reply(JSON.stringify(result) + '\n');
+});